@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-19 09:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_letterrequest_notification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('DIPROSES', 'Dalam Proses'), ('DISETUJUI', 'Disetujui'), ('TELAH_DIAMBIL', 'Telah Diambil'), ('DITOLAK', 'Ditolak')], max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('digested_at', models.DateTimeField(blank=True, null=True)),
+                ('letter_request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_changes', to='core.letterrequest')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_changes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['digested_at', 'user', 'created_at'], name='core_statuschange_pending')],
+            },
+        ),
+    ]
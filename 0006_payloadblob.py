@@ -0,0 +1,123 @@
+# Generated by Django 6.0 on 2026-10-19 11:00
+
+import hashlib
+import json
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+BATCH_SIZE = 1000
+# salinan core.models.PAYLOAD_COLUMN_FIELDS: kolom yang tidak disimpan ulang di blob
+COLUMN_FIELDS = ("nama", "nik", "alamat")
+
+
+def _digest(payload):
+    normalized = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def _blob_data(payload, columns):
+    # sama dengan LetterRequest._blob_data(), supaya blob hasil migrasi dipakai bersama pengajuan baru
+    return {
+        key: value for key, value in payload.items()
+        if not (key in COLUMN_FIELDS and value == columns[key])
+    }
+
+
+def dedupe_payloads(apps, schema_editor):
+    """Pindahkan payload tiap LetterRequest ke PayloadBlob; payload yang sama berbagi satu blob."""
+    LetterRequest = apps.get_model("core", "LetterRequest")
+    PayloadBlob = apps.get_model("core", "PayloadBlob")
+    db = schema_editor.connection.alias
+
+    blob_ids = {}  # digest -> id PayloadBlob
+    batch = []
+
+    def flush():
+        digests = {d for _, d, _ in batch}
+        new = {d: p for _, d, p in batch if d not in blob_ids}
+        if new:
+            PayloadBlob.objects.using(db).bulk_create(
+                [PayloadBlob(digest=d, data=p, ref_count=0) for d, p in new.items()]
+            )
+        blob_ids.update(
+            PayloadBlob.objects.using(db).filter(digest__in=digests).values_list("digest", "id")
+        )
+        LetterRequest.objects.using(db).bulk_update(
+            [LetterRequest(id=pk, payload_blob_id=blob_ids[d]) for pk, d, _ in batch],
+            ["payload_blob"],
+        )
+        batch.clear()
+
+    rows = LetterRequest.objects.using(db).order_by("id").values_list("id", "payload", *COLUMN_FIELDS)
+    for pk, payload, *columns in rows.iterator(chunk_size=BATCH_SIZE):
+        payload = _blob_data(payload or {}, dict(zip(COLUMN_FIELDS, columns)))
+        batch.append((pk, _digest(payload), payload))
+        if len(batch) >= BATCH_SIZE:
+            flush()
+    if batch:
+        flush()
+
+    counts = (
+        LetterRequest.objects.using(db)
+        .values("payload_blob_id")
+        .annotate(n=models.Count("id"))
+        .order_by()
+    )
+    for row in counts:
+        PayloadBlob.objects.using(db).filter(id=row["payload_blob_id"]).update(ref_count=row["n"])
+
+
+def restore_payloads(apps, schema_editor):
+    LetterRequest = apps.get_model("core", "LetterRequest")
+    db = schema_editor.connection.alias
+
+    rows = (
+        LetterRequest.objects.using(db)
+        .select_related("payload_blob")
+        .only("id", "payload_blob__data", *COLUMN_FIELDS)
+    )
+    batch = []
+    for lr in rows.iterator(chunk_size=BATCH_SIZE):
+        # kolom digabung kembali seperti property LetterRequest.payload
+        if lr.payload_blob_id:
+            lr.payload = {**{name: getattr(lr, name) for name in COLUMN_FIELDS}, **lr.payload_blob.data}
+        else:
+            lr.payload = {}
+        batch.append(lr)
+        if len(batch) >= BATCH_SIZE:
+            LetterRequest.objects.using(db).bulk_update(batch, ["payload"])
+            batch.clear()
+    if batch:
+        LetterRequest.objects.using(db).bulk_update(batch, ["payload"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_letterrequest_user_type_status_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayloadBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(max_length=64, unique=True)),
+                ('data', models.JSONField(default=dict)),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='letterrequest',
+            name='payload_blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='letter_requests', to='core.payloadblob'),
+        ),
+        migrations.RunPython(dedupe_payloads, restore_payloads),
+        migrations.RemoveField(
+            model_name='letterrequest',
+            name='payload',
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.0 on 2026-10-19 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_payloadblob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='letterrequest',
+            name='printed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='letterrequest',
+            index=models.Index(fields=['status', 'updated_at'], name='core_lr_status_updated'),
+        ),
+    ]
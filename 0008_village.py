@@ -0,0 +1,41 @@
+# Generated by Django 6.0 on 2026-10-19 15:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_letterrequest_printed_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Village',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nama', models.CharField(max_length=100)),
+                ('slug', models.SlugField(help_text='Dipakai di URL /desa/<slug>/', unique=True)),
+                ('domain', models.CharField(blank=True, db_index=True, help_text='Contoh: sukamaju.desa.id', max_length=253)),
+                ('database_name', models.CharField(blank=True, help_text='Kosong = database utama. Diisi = file SQLite / schema PostgreSQL sendiri.', max_length=63)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='letterrequest',
+            name='village',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='core.village'),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='village',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='core.village'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='village',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='core.village'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-19 16:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_village'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='letterrequest',
+            index=models.Index(fields=['user', 'created_at'], name='core_lr_user_created'),
+        ),
+    ]
@@ -1,6 +1,102 @@
+from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, LetterRequest, Notification, RequestStatus
+from django.core.cache import cache
+from django.db.models import Count
+from .models import User, LetterRequest, Notification, LetterType, RequestStatus, Village
+from .notifications import notify_status_change
+from .pagination import EstimatedCountPaginator
+from .tenancy import scope_queryset
+
+
+# ==========================
+# MODE PERFORMA CHANGELIST
+# ==========================
+# ADMIN_PERFORMANCE_MODE = True (default) untuk tabel besar: kolom changelist
+# dipangkas, jumlah baris diperkirakan dari statistik tabel, dan jumlah per
+# pilihan filter diambil dari cache (bukan facet COUNT tiap buka halaman).
+
+def performance_mode():
+    return getattr(settings, "ADMIN_PERFORMANCE_MODE", True)
+
+
+class CachedCountFilter(admin.SimpleListFilter):
+    """Filter pilihan tetap dengan jumlah per pilihan yang di-cache beberapa detik."""
+    field_name = None
+    options = ()
+
+    def _counts(self, model):
+        key = f"core:admin_facets:{model._meta.label_lower}:{self.field_name}"
+        counts = cache.get(key)
+        if counts is None:
+            rows = scope_queryset(model.objects.all()).values_list(self.field_name).annotate(n=Count("pk")).order_by()
+            counts = {str(value): n for value, n in rows}
+            cache.set(key, counts, getattr(settings, "ADMIN_FACET_CACHE_SECONDS", 60))
+        return counts
+
+    def lookups(self, request, model_admin):
+        counts = self._counts(model_admin.model)
+        return [(value, f"{label} ({counts.get(str(value), 0):,})") for value, label in self.options]
+
+    def queryset(self, request, queryset):
+        if self.value() is None:
+            return queryset
+        return queryset.filter(**{self.field_name: self.value()})
+
+
+class LetterTypeFilter(CachedCountFilter):
+    title = "letter type"
+    parameter_name = field_name = "letter_type"
+    options = LetterType.choices
+
+
+class StatusFilter(CachedCountFilter):
+    title = "status"
+    parameter_name = field_name = "status"
+    options = RequestStatus.choices
+
+
+class IsReadFilter(CachedCountFilter):
+    title = "is read"
+    parameter_name = field_name = "is_read"
+    options = (("True", "Sudah dibaca"), ("False", "Belum dibaca"))
+
+    def queryset(self, request, queryset):
+        if self.value() is None:
+            return queryset
+        return queryset.filter(is_read=self.value() == "True")
+
+
+class PerformanceModeAdmin(admin.ModelAdmin):
+    # kolom yang diambil di changelist (sesuai list_display)
+    changelist_only = ()
+    performance_list_filter = ()
+
+    def get_list_filter(self, request):
+        if performance_mode():
+            return self.performance_list_filter
+        return super().get_list_filter(request)
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        if performance_mode():
+            return EstimatedCountPaginator(queryset, per_page, orphans, allow_empty_first_page)
+        return super().get_paginator(request, queryset, per_page, orphans, allow_empty_first_page)
+
+    def get_queryset(self, request):
+        qs = scope_queryset(super().get_queryset(request))
+        match = getattr(request, "resolver_match", None)
+        if performance_mode() and self.changelist_only and match and match.url_name.endswith("_changelist"):
+            qs = qs.only(*self.changelist_only)
+        return qs
+
+    @property
+    def show_full_result_count(self):
+        # "x hasil (y total)" butuh COUNT(*) kedua untuk seluruh tabel
+        return not performance_mode()
+
+    @property
+    def show_facets(self):
+        return admin.ShowFacets.NEVER if performance_mode() else admin.ShowFacets.ALLOW
 
 
 @admin.register(User)
@@ -26,14 +122,27 @@ class UserAdmin(BaseUserAdmin):
 
     filter_horizontal = ("groups", "user_permissions")
 
+    def get_queryset(self, request):
+        return scope_queryset(super().get_queryset(request))
+
+
+@admin.register(Village)
+class VillageAdmin(admin.ModelAdmin):
+    list_display = ("nama", "slug", "domain", "database_name", "is_active")
+    search_fields = ("nama", "slug", "domain")
+    prepopulated_fields = {"slug": ("nama",)}
+
 
 @admin.register(LetterRequest)
-class LetterRequestAdmin(admin.ModelAdmin):
+class LetterRequestAdmin(PerformanceModeAdmin):
     ordering = ("-created_at",)
     list_display = ("id", "nik", "nama", "letter_type", "status", "created_at")
     list_filter = ("letter_type", "status")
     search_fields = ("nik", "nama")
 
+    changelist_only = ("id", "nik", "nama", "letter_type", "status", "created_at")
+    performance_list_filter = (LetterTypeFilter, StatusFilter)
+
     # Admin hanya boleh ubah STATUS. Data warga read-only.
     readonly_fields = (
         "user", "letter_type", "nama", "nik", "alamat", "payload",
@@ -54,36 +163,26 @@ class LetterRequestAdmin(admin.ModelAdmin):
     def save_model(self, request, obj, form, change):
         old_status = None
         if change and obj.pk:
-            old_status = LetterRequest.objects.get(pk=obj.pk).status
+            old_status = LetterRequest.objects.values_list("status", flat=True).get(pk=obj.pk)
 
         super().save_model(request, obj, form, change)
 
-        # Buat notifikasi hanya jika status berubah
+        # Buat notifikasi hanya jika status berubah (langsung, atau lewat digest)
         if change and old_status != obj.status:
-            if obj.status == RequestStatus.DISETUJUI:
-                Notification.objects.create(
-                    user=obj.user,
-                    title="Surat Disetujui",
-                    message=(
-                        "Surat kamu telah disetujui. Silahkan datang ke kantor desa untuk mengambil surat. "
-                        "Harap membawa KTP atau KK sebagai bukti pengambilan."
-                    ),
-                )
-            elif obj.status == RequestStatus.TELAH_DIAMBIL:
-                Notification.objects.create(
-                    user=obj.user,
-                    title="Surat Telah Diambil",
-                    message=f"{obj.get_letter_type_display()} - Telah Diambil.",
-                )
+            notify_status_change(obj)
 
 
 @admin.register(Notification)
-class NotificationAdmin(admin.ModelAdmin):
+class NotificationAdmin(PerformanceModeAdmin):
     ordering = ("-created_at",)
     list_display = ("id", "user", "title", "is_read", "created_at")
     list_filter = ("is_read",)
+    list_select_related = ("user",)
     search_fields = ("user__nik", "user__nama", "title", "message")
 
+    changelist_only = ("id", "title", "is_read", "created_at", "user__nik", "user__nama")
+    performance_list_filter = (IsReadFilter,)
+
     readonly_fields = ("user", "title", "message", "created_at", "is_read")
     fields = ("user", "title", "message", "created_at", "is_read")
 
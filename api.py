@@ -0,0 +1,392 @@
+# core/api.py
+# JSON API (v1) untuk klien kiosk / mobile, supaya tidak perlu scraping halaman HTML.
+import base64
+import binascii
+import hashlib
+import json
+from datetime import datetime
+from functools import wraps
+
+from django.contrib.auth import get_user_model
+from django.db import router, transaction
+from django.db.models import Count, Max, Q
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.http import condition, require_http_methods
+
+from .counters import invalidate_status_counts
+from .models import LetterRequest, LetterType, RequestStatus, Notification
+from .tenancy import scope_queryset
+from .views import FORM_BY_TYPE, _jsonable
+
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+MAX_BATCH_ITEMS = 500
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def _error(message, status=400, **extra):
+    return JsonResponse({"error": message, **extra}, status=status)
+
+
+def warga_api(view):
+    """
+    Versi JSON dari @login_required + cek warga:
+    401 kalau belum login, 403 kalau akun staff (staff pakai /admin/),
+    dan error ditulis sebagai JSON, bukan halaman HTML.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return _error("Silahkan login terlebih dahulu.", status=401)
+        if request.user.is_staff:
+            return _error("Endpoint ini khusus akun warga.", status=403)
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as exc:
+            return _error(exc.message, status=exc.status)
+        except Http404:
+            return _error("Data tidak ditemukan.", status=404)
+    return wrapper
+
+
+def staff_api(view):
+    """Seperti warga_api, tapi khusus akun staff (mis. operator kiosk desa)."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return _error("Silahkan login terlebih dahulu.", status=401)
+        if not request.user.is_staff:
+            return _error("Endpoint ini khusus akun staff.", status=403)
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as exc:
+            return _error(exc.message, status=exc.status)
+    return wrapper
+
+
+def _read_json(request):
+    if not request.body:
+        return {}
+    try:
+        data = json.loads(request.body)
+    except (ValueError, UnicodeDecodeError):
+        raise ApiError("Body harus JSON yang valid.")
+    if not isinstance(data, dict):
+        raise ApiError("Body harus berupa objek JSON.")
+    return data
+
+
+def _letter_type(value):
+    if not isinstance(value, str) or value not in FORM_BY_TYPE:
+        raise ApiError("Jenis surat tidak dikenal.")
+    return value
+
+
+def _form_data(value):
+    """
+    Field `data` sebagai input form: form Django mengharapkan string seperti POST
+    biasa, jadi angka/boolean diubah ke string dan list/objek bersarang ditolak.
+    """
+    data = value or {}
+    if not isinstance(data, dict):
+        raise ApiError("Field data harus berupa objek JSON.")
+    cleaned = {}
+    for name, field_value in data.items():
+        if isinstance(field_value, (list, dict)):
+            raise ApiError(f"Field data.{name} harus berupa teks atau angka.")
+        cleaned[name] = field_value if field_value is None else str(field_value)
+    return cleaned
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def serialize_letter(lr, with_payload=False):
+    data = {
+        "id": lr.id,
+        "letter_type": lr.letter_type,
+        "letter_label": lr.get_letter_type_display(),
+        "status": lr.status,
+        "status_label": lr.get_status_display(),
+        "nama": lr.nama,
+        "nik": lr.nik,
+        "alamat": lr.alamat,
+        "created_at": _iso(lr.created_at),
+        "updated_at": _iso(lr.updated_at),
+    }
+    if with_payload:
+        data["payload"] = lr.payload
+    return data
+
+
+def serialize_notification(n):
+    return {
+        "id": n.id,
+        "title": n.title,
+        "message": n.message,
+        "is_read": n.is_read,
+        "created_at": _iso(n.created_at),
+    }
+
+
+# ==========================
+# CURSOR PAGINATION
+# ==========================
+# Cursor = base64("<created_at iso>|<id>") dari item terakhir halaman sebelumnya.
+# Urutan (-created_at, -id) sama dengan urutan halaman HTML, dan tidak butuh COUNT(*)/OFFSET.
+
+def _encode_cursor(obj):
+    raw = f"{obj.created_at.isoformat()}|{obj.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, pk = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise ApiError("Cursor tidak valid.")
+
+
+def _page_params(request):
+    cursor = request.GET.get("cursor") or ""
+    try:
+        limit = int(request.GET.get("limit") or DEFAULT_PAGE_SIZE)
+    except ValueError:
+        raise ApiError("Parameter limit harus angka.")
+    return cursor, max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def _paginate(qs, request):
+    cursor, limit = _page_params(request)
+    qs = qs.order_by("-created_at", "-id")
+    if cursor:
+        created_at, pk = _decode_cursor(cursor)
+        qs = qs.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+
+    rows = list(qs[: limit + 1])
+    items = rows[:limit]
+    next_cursor = _encode_cursor(items[-1]) if len(rows) > limit else None
+    return items, next_cursor
+
+
+# ==========================
+# ETAG / LAST-MODIFIED
+# ==========================
+# Dihitung dari satu query agregat (COUNT + MAX) sehingga request kondisional
+# yang cocok langsung dijawab 304 tanpa mengambil baris / serialisasi.
+
+def _list_state(request, qs, stamp_field, **extra):
+    cache_attr = "_api_list_state"
+    state = getattr(request, cache_attr, None)
+    if state is None:
+        state = qs.aggregate(n=Count("id"), last=Max(stamp_field), **extra)
+        setattr(request, cache_attr, state)
+    return state
+
+
+def _make_etag(*parts):
+    return hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()
+
+
+def _list_etag(request, qs, stamp_field, **extra):
+    state = _list_state(request, qs, stamp_field, **extra)
+    cursor, limit = _page_params(request)
+    return _make_etag(request.user.pk, state["n"], _iso(state["last"]), *(state[k] for k in extra), cursor, limit)
+
+
+def _status_qs(request):
+    return LetterRequest.objects.filter(user=request.user)
+
+
+def _notif_qs(request):
+    return Notification.objects.filter(user=request.user)
+
+
+def _status_etag(request):
+    return _list_etag(request, _status_qs(request), "updated_at")
+
+
+def _status_last_modified(request):
+    return _list_state(request, _status_qs(request), "updated_at")["last"]
+
+
+def _notif_etag(request):
+    # is_read tidak mengubah created_at; jumlah yang belum dibaca ikut menentukan ETag
+    return _list_etag(request, _notif_qs(request), "created_at", unread=Count("id", filter=Q(is_read=False)))
+
+
+def _letter_stamp(request, pk):
+    return (
+        LetterRequest.objects.filter(pk=pk, user=request.user)
+        .values_list("updated_at", flat=True)
+        .first()
+    )
+
+
+def _letter_etag(request, pk):
+    stamp = _letter_stamp(request, pk)
+    return _make_etag(pk, _iso(stamp)) if stamp else None
+
+
+# ==========================
+# ENDPOINTS
+# ==========================
+
+@require_http_methods(["GET"])
+def jenis_surat(request):
+    types = []
+    for value, label in LetterType.choices:
+        fields = []
+        for name, field in FORM_BY_TYPE[value].base_fields.items():
+            info = {"name": name, "required": field.required}
+            choices = getattr(field, "choices", None)
+            if choices:
+                info["choices"] = [c for c, _ in choices]
+            fields.append(info)
+        types.append({"value": value, "label": label, "fields": fields})
+
+    response = JsonResponse({"results": types})
+    response["Cache-Control"] = "public, max-age=3600"
+    return response
+
+
+@warga_api
+@require_http_methods(["GET", "POST"])
+def surat_list(request):
+    if request.method == "POST":
+        return _ajukan_surat(request)
+    return _status_list(request)
+
+
+@condition(etag_func=_status_etag, last_modified_func=_status_last_modified)
+def _status_list(request):
+    items, next_cursor = _paginate(_status_qs(request), request)
+    return JsonResponse({
+        "results": [serialize_letter(lr) for lr in items],
+        "next_cursor": next_cursor,
+    })
+
+
+def _letter_from_form(user, letter_type, form):
+    """LetterRequest (belum disimpan) dari form surat yang sudah valid."""
+    payload = _jsonable(form.cleaned_data)
+    return LetterRequest(
+        user=user,
+        letter_type=letter_type,
+        status=RequestStatus.DIPROSES,
+        nama=payload["nama"],
+        nik=payload["nik"],
+        alamat=payload["alamat"],
+        payload=payload,
+        village_id=user.village_id,  # bulk_create tidak lewat signal pre_save
+    )
+
+
+def _ajukan_surat(request):
+    body = _read_json(request)
+    letter_type = _letter_type(body.get("letter_type"))
+    form = FORM_BY_TYPE[letter_type](_form_data(body.get("data")), user=request.user)
+    if not form.is_valid():
+        return _error("Data surat tidak valid.", errors=form.errors.get_json_data())
+
+    lr = _letter_from_form(request.user, letter_type, form)
+    lr.save()
+    response = JsonResponse(serialize_letter(lr, with_payload=True), status=201)
+    response["Location"] = reverse("api_surat_detail", args=[lr.id])
+    return response
+
+
+@warga_api
+@require_http_methods(["GET"])
+@condition(etag_func=_letter_etag, last_modified_func=_letter_stamp)
+def surat_detail(request, pk):
+    lr = get_object_or_404(LetterRequest, pk=pk, user=request.user)
+    return JsonResponse(serialize_letter(lr, with_payload=True))
+
+
+@warga_api
+@require_http_methods(["GET"])
+@condition(etag_func=_notif_etag)  # tanpa Last-Modified: tandai dibaca tidak punya timestamp
+def notifikasi_list(request):
+    items, next_cursor = _paginate(_notif_qs(request), request)
+    return JsonResponse({
+        "results": [serialize_notification(n) for n in items],
+        "next_cursor": next_cursor,
+    })
+
+
+@staff_api
+@require_http_methods(["POST"])
+def surat_batch(request):
+    """
+    Sinkronisasi kiosk offline: banyak pengajuan (banyak NIK) dalam satu request.
+
+    Body: {"items": [{"ref": "...", "nik": "...", "letter_type": "SKTM", "data": {...}}, ...]}
+    Item yang valid disimpan sekaligus (satu transaksi, bulk_create); item yang tidak
+    valid dilaporkan per index tanpa menggagalkan item lain.
+    """
+    items = _read_json(request).get("items")
+    if not isinstance(items, list) or not items:
+        raise ApiError("Field items harus berupa list yang tidak kosong.")
+    if len(items) > MAX_BATCH_ITEMS:
+        raise ApiError(f"Maksimal {MAX_BATCH_ITEMS} item per batch.")
+
+    # satu query untuk semua warga di batch ini; NIK warga desa lain dianggap belum terdaftar
+    niks = {str(item.get("nik") or "").strip() for item in items if isinstance(item, dict)}
+    users = scope_queryset(get_user_model().objects.filter(nik__in=niks, is_staff=False)).in_bulk(field_name="nik")
+
+    results = []
+    pending = []  # (index hasil, LetterRequest)
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results.append({"index": index, "ok": False, "error": "Item harus berupa objek JSON."})
+            continue
+
+        result = {"index": index, "ref": item.get("ref")}
+        results.append(result)
+
+        # validasi yang sama dengan pengajuan tunggal, tapi gagal per item, bukan per batch
+        try:
+            letter_type = _letter_type(item.get("letter_type"))
+            user = users.get(str(item.get("nik") or "").strip())
+            if user is None:
+                raise ApiError("NIK belum terdaftar.")
+            data = _form_data(item.get("data"))
+        except ApiError as exc:
+            result.update(ok=False, error=exc.message)
+            continue
+
+        form = FORM_BY_TYPE[letter_type]({"nik": user.nik, **data}, user=user)
+        if not form.is_valid():
+            result.update(ok=False, error="Data surat tidak valid.", errors=form.errors.get_json_data())
+            continue
+
+        pending.append((result, _letter_from_form(user, letter_type, form)))
+
+    with transaction.atomic(using=router.db_for_write(LetterRequest)):
+        created = LetterRequest.objects.bulk_create([lr for _, lr in pending])
+
+    # bulk_create tidak mengirim signal post_save
+    for user_id in {lr.user_id for lr in created}:
+        invalidate_status_counts(user_id)
+
+    for (result, _), lr in zip(pending, created):
+        result.update(ok=True, id=lr.id)
+
+    return JsonResponse({
+        "created": len(created),
+        "failed": len(results) - len(created),
+        "results": results,
+    })
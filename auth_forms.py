@@ -1,8 +1,7 @@
 from django import forms
 from django.core.exceptions import ValidationError
-from django.contrib.auth import get_user_model
 
-User = get_user_model()
+from . import nik_registry
 
 
 class WargaRegisterForm(forms.Form):
@@ -42,7 +41,7 @@ class WargaRegisterForm(forms.Form):
             raise ValidationError("NIK hanya boleh angka.")
         if len(nik) != 16:
             raise ValidationError("NIK harus 16 digit.")
-        if User.objects.filter(nik=nik).exists():
+        if nik_registry.is_registered(nik):
             raise ValidationError("NIK sudah terdaftar. Silahkan login.")
         return nik
 
@@ -0,0 +1,44 @@
+# core/counters.py
+# Jumlah pengajuan per warga per (jenis surat, status), di-cache.
+# Dihapus dari cache oleh signal setiap LetterRequest milik warga itu berubah. Cache
+# bisa per proses (LocMem), jadi isi cache juga dicocokkan dengan versi data warga
+# (COUNT + MAX(updated_at)) supaya perubahan dari worker lain langsung terlihat.
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from .models import LetterRequest
+
+
+CACHE_TIMEOUT = 60 * 60
+
+
+def _key(user_id):
+    return f"core:status_counts:{user_id}"
+
+
+def _version(user_id):
+    # berubah setiap ada surat warga ini yang dibuat, diubah, atau dihapus
+    state = LetterRequest.objects.filter(user_id=user_id).aggregate(n=Count("id"), last=Max("updated_at"))
+    return state["n"], state["last"]
+
+
+def status_counts(user_id):
+    """{(letter_type, status): jumlah} untuk satu warga."""
+    version = _version(user_id)
+    cached = cache.get(_key(user_id))
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    rows = (
+        LetterRequest.objects.filter(user_id=user_id)
+        .values_list("letter_type", "status")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    counts = {(letter_type, status): n for letter_type, status, n in rows}
+    cache.set(_key(user_id), (version, counts), CACHE_TIMEOUT)
+    return counts
+
+
+def invalidate_status_counts(user_id):
+    cache.delete(_key(user_id))
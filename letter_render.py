@@ -0,0 +1,72 @@
+# core/letter_render.py
+# Render surat ke HTML siap cetak. Hanya memakai standard library (tanpa Django),
+# karena dijalankan di proses worker ProcessPoolExecutor (lihat core/printing.py);
+# data surat sudah disiapkan sebagai dict biasa oleh proses utama.
+from html import escape
+
+
+DOCUMENT_HEAD = """<!doctype html>
+<html lang="id">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+  body {{ font-family: "Times New Roman", serif; font-size: 12pt; margin: 0; }}
+  .surat {{ padding: 2cm; page-break-after: always; break-after: page; }}
+  .surat:last-child {{ page-break-after: auto; break-after: auto; }}
+  .kop {{ text-align: center; border-bottom: 3px double #000; padding-bottom: 8px; margin-bottom: 16px; }}
+  .kop h1 {{ font-size: 16pt; margin: 0; }}
+  .judul {{ text-align: center; margin-bottom: 16px; }}
+  .judul h2 {{ font-size: 14pt; margin: 0; text-decoration: underline; }}
+  table.data {{ border-collapse: collapse; margin: 8px 0 16px 24px; }}
+  table.data td {{ padding: 2px 8px; vertical-align: top; }}
+  .ttd {{ margin-top: 48px; margin-left: 60%; text-align: center; }}
+  @media screen {{ .surat {{ border-bottom: 1px dashed #999; }} }}
+</style>
+</head>
+<body onload="window.print()">
+"""
+
+DOCUMENT_TAIL = "</body>\n</html>\n"
+
+
+def document_head(title):
+    return DOCUMENT_HEAD.format(title=escape(title))
+
+
+def document_tail():
+    return DOCUMENT_TAIL
+
+
+def render_letter(letter):
+    """
+    Satu surat (satu halaman cetak). `letter` berisi: id, judul, nomor, tanggal,
+    desa, rows (list pasangan label/nilai).
+    """
+    rows = "\n".join(
+        f"    <tr><td>{escape(label)}</td><td>:</td><td>{escape(str(value))}</td></tr>"
+        for label, value in letter["rows"]
+    )
+    return f"""<section class="surat">
+  <div class="kop"><h1>{escape(letter["desa"])}</h1></div>
+  <div class="judul">
+    <h2>{escape(letter["judul"])}</h2>
+    <div>Nomor: {escape(letter["nomor"])}</div>
+  </div>
+  <p>Yang bertanda tangan di bawah ini menerangkan bahwa:</p>
+  <table class="data">
+{rows}
+  </table>
+  <p>Demikian surat keterangan ini dibuat untuk dipergunakan sebagaimana mestinya.</p>
+  <div class="ttd">
+    <div>{escape(letter["tanggal"])}</div>
+    <div>Kepala Desa</div>
+    <div style="margin-top:64px;">(...............................)</div>
+  </div>
+</section>
+"""
+
+
+def render_letters(letters):
+    """Satu batch surat -> potongan HTML. Fungsi ini yang dikirim ke proses worker."""
+    return "".join(render_letter(letter) for letter in letters)
@@ -0,0 +1,261 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, connections, router, transaction
+from django.forms import ChoiceField
+from django.utils import timezone
+
+from core.models import LetterRequest, LetterType, Notification, RequestStatus
+from core.notifications import _message_for
+from core.retention import delete_in_chunks
+from core.tenancy import get_current_village
+
+
+PASSWORD = "DataUji123!"
+# penanda akun hasil generator (dipakai --clear); domain .invalid tidak pernah bisa menerima email
+EMAIL_DOMAIN = "fixture.invalid"
+
+# kode wilayah (provinsi-kabupaten-kecamatan) untuk 6 digit pertama NIK
+REGION_CODES = [
+    "320101", "320102", "320103", "320411", "320412", "320713",
+    "330101", "330204", "331501", "350101", "350817", "357801",
+    "327301", "327302", "360101", "360302", "510101", "730101",
+]
+WA_PREFIXES = ["0812", "0813", "0821", "0822", "0852", "0857", "0877", "0878", "0881", "0895", "0896"]
+
+FIRST_NAMES = [
+    "Agus", "Budi", "Dewi", "Eka", "Fitri", "Gilang", "Hendra", "Indah", "Joko", "Kartika",
+    "Lestari", "Made", "Nur", "Putri", "Rina", "Siti", "Taufik", "Wahyu", "Yuni", "Rizky",
+]
+LAST_NAMES = [
+    "Pratama", "Saputra", "Wijaya", "Susanto", "Hidayat", "Kurniawan", "Lestari", "Rahmawati",
+    "Setiawan", "Nugroho", "Permana", "Hasanah", "Siregar", "Nasution", "Gunawan", "Purnama",
+]
+PLACES = ["Bandung", "Garut", "Bogor", "Cirebon", "Tasikmalaya", "Sumedang", "Semarang", "Surabaya"]
+JOBS = ["Petani", "Pedagang", "Buruh", "Karyawan Swasta", "Guru", "Wiraswasta", "Pelajar", "Ibu Rumah Tangga"]
+STREETS = ["Jl. Melati", "Jl. Mawar", "Jl. Kenanga", "Jl. Raya Desa", "Gg. Masjid", "Jl. Sawah"]
+
+LETTER_WEIGHTS = {
+    LetterType.SKTM: 35,
+    LetterType.DOMISILI: 30,
+    LetterType.SKCK: 25,
+    LetterType.BELUM_MENIKAH: 10,
+}
+STATUS_WEIGHTS = {
+    RequestStatus.DIPROSES: 15,
+    RequestStatus.DISETUJUI: 20,
+    RequestStatus.TELAH_DIAMBIL: 55,
+    RequestStatus.DITOLAK: 10,
+}
+# jumlah pengajuan per warga: banyak yang 0-2, sedikit yang sering mengajukan
+LETTERS_PER_USER = [0, 1, 1, 2, 2, 3, 4, 6]
+
+DOB_START = date(1960, 1, 1)
+DOB_SPAN_DAYS = 365 * 55  # tahun lahir 1960-2014, dua digit tahun tetap unik
+
+
+class _Resident:
+    """Data warga yang dibuat generator, dipakai lagi untuk isi payload surat."""
+
+    def __init__(self, index, rng):
+        self.region = REGION_CODES[index % len(REGION_CODES)]
+        n = index // len(REGION_CODES)
+        # (wilayah, tanggal lahir, nomor urut) unik untuk setiap index
+        self.birth_date = DOB_START + timedelta(days=n * 7919 % DOB_SPAN_DAYS)
+        self.serial = n // DOB_SPAN_DAYS + 1
+        self.gender = rng.choice("LP")
+        self.nama = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        self.alamat = f"{rng.choice(STREETS)} No. {rng.randint(1, 200)}, RT {rng.randint(1, 12):02d}/RW {rng.randint(1, 8):02d}"
+        self.tempat_lahir = rng.choice(PLACES)
+        self.pekerjaan = rng.choice(JOBS)
+
+    @property
+    def nik(self):
+        # DDMMYY, tanggal + 40 untuk perempuan (format NIK Dukcapil)
+        day = self.birth_date.day + (40 if self.gender == "P" else 0)
+        return f"{self.region}{day:02d}{self.birth_date:%m%y}{self.serial:04d}"
+
+
+def _wa_number(rng):
+    number = f"{rng.choice(WA_PREFIXES)}{rng.randint(0, 10 ** 8 - 1):08d}"
+    return "+62" + number[1:] if rng.random() < 0.3 else number
+
+
+def _payload(resident, letter_type, specs, rng):
+    """Payload valid untuk form jenis surat ini (field & pilihan diambil dari form-nya)."""
+    values = {
+        "nama": resident.nama,
+        "nik": resident.nik,
+        "tempat_lahir": resident.tempat_lahir,
+        "tanggal_lahir": resident.birth_date.isoformat(),
+        "jenis_kelamin": resident.gender,
+        "pekerjaan": resident.pekerjaan,
+        "alamat": resident.alamat,
+    }
+    payload = {}
+    for name, choices in specs[letter_type]:
+        if name in values:
+            payload[name] = values[name]
+        elif choices:
+            payload[name] = rng.choice(choices)
+    return payload
+
+
+def _form_specs():
+    from core.views import FORM_BY_TYPE
+
+    return {
+        letter_type: [
+            (name, [value for value, _ in field.choices] if isinstance(field, ChoiceField) else None)
+            for name, field in form_cls.base_fields.items()
+        ]
+        for letter_type, form_cls in FORM_BY_TYPE.items()
+    }
+
+
+def _set_timestamps(model, fields, rows):
+    """
+    Timpa kolom auto_now/auto_now_add setelah bulk_create. Pakai executemany, bukan
+    bulk_update: bulk_update membangun CASE WHEN per baris dan jadi bagian paling lambat.
+    `rows` berisi (nilai field..., pk).
+    """
+    connection = connections[router.db_for_write(model)]
+    table = connection.ops.quote_name(model._meta.db_table)
+    assignments = ", ".join(f"{connection.ops.quote_name(f)} = %s" for f in fields)
+    adapt = connection.ops.adapt_datetimefield_value
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"UPDATE {table} SET {assignments} WHERE id = %s",
+            [[adapt(v) for v in row[:-1]] + [row[-1]] for row in rows],
+        )
+
+
+def _weighted(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+class Command(BaseCommand):
+    help = (
+        "Buat data sintetis dalam jumlah besar (warga, pengajuan surat, notifikasi) yang deterministik "
+        "untuk uji performa. Semua akun memakai password yang sama dan email @fixture.invalid."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000, help="Jumlah warga.")
+        parser.add_argument("--seed", type=int, default=42, help="Seed; seed sama = data sama.")
+        parser.add_argument("--days", type=int, default=365, help="Sebaran created_at ke belakang (hari).")
+        parser.add_argument("--batch-size", type=int, default=2000, help="Warga per batch/transaksi.")
+        parser.add_argument("--password", default=PASSWORD)
+        parser.add_argument("--clear", action="store_true", help="Hapus data generator sebelumnya dulu.")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        fixtures = User.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}")
+        if options["clear"]:
+            deleted = delete_in_chunks(fixtures, 500)
+            self.stdout.write(f"{deleted} akun data uji lama dihapus.")
+        elif fixtures.exists():
+            raise CommandError("Data uji sudah ada. Jalankan dengan --clear untuk membuat ulang.")
+
+        rng = random.Random(options["seed"])
+        password = make_password(options["password"])  # hash sekali, dipakai semua akun
+        specs = _form_specs()
+        now = timezone.now()
+        totals = {"users": 0, "letters": 0, "notifications": 0}
+        started = time.perf_counter()
+
+        for start in range(0, options["users"], options["batch_size"]):
+            end = min(start + options["batch_size"], options["users"])
+            try:
+                with transaction.atomic(using=router.db_for_write(LetterRequest)):
+                    counts = self._batch(range(start, end), rng, password, specs, now, options["days"])
+            except IntegrityError as exc:
+                raise CommandError(f"Gagal menyimpan batch {start}-{end} (NIK bentrok dengan data lain?): {exc}")
+            for key, n in counts.items():
+                totals[key] += n
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"  {end}/{options['users']} warga, {totals['letters']} surat, "
+                f"{totals['notifications']} notifikasi ({elapsed:.1f} s)"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Selesai: {totals['users']} warga, {totals['letters']} surat, "
+            f"{totals['notifications']} notifikasi dalam {time.perf_counter() - started:.1f} s."
+        ))
+
+    def _batch(self, indexes, rng, password, specs, now, days):
+        User = get_user_model()
+        village = get_current_village()  # lewat `village_run`; bulk_create tidak lewat signal pre_save
+        village_id = village.pk if village else None
+        residents = [_Resident(i, rng) for i in indexes]
+        users = User.objects.bulk_create([
+            User(
+                nik=r.nik,
+                nama=r.nama,
+                no_wa=_wa_number(rng),
+                email=f"warga{i}@{EMAIL_DOMAIN}",
+                password=password,
+                village_id=village_id,
+            )
+            for i, r in zip(indexes, residents)
+        ])
+        if users and users[0].pk is None:  # backend tanpa RETURNING pada bulk insert
+            by_nik = User.objects.filter(nik__in=[u.nik for u in users]).in_bulk(field_name="nik")
+            users = [by_nik[u.nik] for u in users]
+
+        letters, stamps = [], []
+        for user, resident in zip(users, residents):
+            for _ in range(rng.choice(LETTERS_PER_USER)):
+                letter_type = _weighted(rng, LETTER_WEIGHTS)
+                status = _weighted(rng, STATUS_WEIGHTS)
+                created = now - timedelta(seconds=rng.randint(0, days * 86400))
+                updated = created
+                if status != RequestStatus.DIPROSES:
+                    updated = min(now, created + timedelta(hours=rng.randint(1, 24 * 14)))
+                letters.append(LetterRequest(
+                    user=user,
+                    letter_type=letter_type,
+                    status=status,
+                    nama=resident.nama,
+                    nik=resident.nik,
+                    alamat=resident.alamat,
+                    payload=_payload(resident, letter_type, specs, rng),
+                    village_id=village_id,
+                ))
+                stamps.append((created, updated))
+        letters = LetterRequest.objects.bulk_create(letters)
+
+        # auto_now_add/auto_now diisi saat insert; sebarkan waktunya setelahnya
+        _set_timestamps(
+            LetterRequest,
+            ["created_at", "updated_at"],
+            [(created, updated, lr.pk) for lr, (created, updated) in zip(letters, stamps)],
+        )
+
+        notifications, notif_stamps = [], []
+        for lr, (created, updated) in zip(letters, stamps):
+            label = LetterType(lr.letter_type).label
+            steps = {
+                RequestStatus.DISETUJUI: [RequestStatus.DISETUJUI],
+                RequestStatus.TELAH_DIAMBIL: [RequestStatus.DISETUJUI, RequestStatus.TELAH_DIAMBIL],
+            }.get(lr.status, [])
+            for n, status in enumerate(steps, start=1):
+                title, message = _message_for(status, label)
+                at = created + (updated - created) * n / len(steps)
+                notifications.append(Notification(
+                    user_id=lr.user_id,
+                    title=title,
+                    message=message,
+                    is_read=(now - at).days > 7 or rng.random() < 0.5,
+                    village_id=village_id,
+                ))
+                notif_stamps.append(at)
+        notifications = Notification.objects.bulk_create(notifications)
+        if notifications and notifications[0].pk is not None:
+            _set_timestamps(Notification, ["created_at"], [(at, n.pk) for n, at in zip(notifications, notif_stamps)])
+
+        return {"users": len(users), "letters": len(letters), "notifications": len(notifications)}
@@ -0,0 +1,331 @@
+import logging
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import HTTPCookieProcessor, build_opener
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Permission
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.signals import got_request_exception
+from django.db import OperationalError
+
+from core.models import LetterRequest, LetterType, RequestStatus
+
+
+RESIDENT_NIK_PREFIX = "99"
+STAFF_NIK_PREFIX = "98"
+
+# batas atas bucket histogram latensi (ms)
+BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+CSRF_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}  # endpoint -> [detik]
+        self.errors = {}  # endpoint -> jumlah
+        self.lock_timeouts = 0
+        self.residents_done = 0
+        # server eksternal: lock timeout hanya bisa dideteksi dari halaman error 500
+        self.locks_from_body = False
+
+    def record(self, endpoint, seconds, ok):
+        with self.lock:
+            self.latencies.setdefault(endpoint, []).append(seconds)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def lock_timeout(self):
+        with self.lock:
+            self.lock_timeouts += 1
+
+
+class Client:
+    """Satu 'browser' simulasi: cookie jar sendiri, CSRF diambil dari halaman terakhir."""
+
+    def __init__(self, base_url, stats):
+        self.base_url = base_url.rstrip("/")
+        self.stats = stats
+        self.opener = build_opener(HTTPCookieProcessor(CookieJar()))
+        self.csrf = None
+
+    def request(self, endpoint, path, data=None):
+        body = urlencode({"csrfmiddlewaretoken": self.csrf, **data}).encode() if data is not None else None
+        started = time.perf_counter()
+        ok, html = True, ""
+        try:
+            with self.opener.open(self.base_url + path, data=body, timeout=60) as res:
+                html = res.read().decode("utf-8", "replace")
+        except HTTPError as exc:
+            ok = False
+            html = exc.read().decode("utf-8", "replace")
+            if self.stats.locks_from_body and "database is locked" in html:
+                self.stats.lock_timeout()
+        except (URLError, OSError):
+            ok = False
+        self.stats.record(endpoint, time.perf_counter() - started, ok)
+
+        match = CSRF_RE.search(html)
+        if match:
+            self.csrf = match.group(1)
+        return ok, html
+
+    def login(self, nik, password):
+        self.request("login GET", "/login/")
+        return self.request("login POST", "/login/", {"nik": nik, "password": password})
+
+
+def _surat_data(user, letter_type):
+    data = {
+        "nama": user.nama,
+        "nik": user.nik,
+        "tempat_lahir": "Bandung",
+        "tanggal_lahir": "1990-01-01",
+        "jenis_kelamin": "L",
+        "pekerjaan": "Petani",
+        "alamat": "Jl. Uji Beban No. 1",
+    }
+    if letter_type != LetterType.SKTM:
+        data["agama"] = "ISLAM"
+    if letter_type in (LetterType.DOMISILI, LetterType.SKCK):
+        data["status_pernikahan"] = "MENIKAH"
+    if letter_type == LetterType.DOMISILI:
+        data["kewarganegaraan"] = "WNI"
+    return data
+
+
+def _resident_flow(base_url, stats, user, password, rng):
+    """Login lalu jalani wizard ajukan surat sampai selesai, terakhir cek status."""
+    client = Client(base_url, stats)
+    ok, _ = client.login(user.nik, password)
+    if not ok:
+        return
+
+    letter_type = rng.choice(LetterType.values)
+    data = _surat_data(user, letter_type)
+
+    client.request("ajukan_surat GET", "/warga/ajukan/")
+    # POST pilih jenis surat -> redirect ke form isi_surat (GET)
+    client.request("ajukan_surat POST", "/warga/ajukan/", {"letter_type": letter_type})
+    # POST isi_surat -> redirect ke verifikasi_pengajuan (GET)
+    client.request("isi_surat POST", f"/warga/ajukan/{letter_type}/", data)
+    ok, _ = client.request(
+        "verifikasi_pengajuan POST",
+        "/warga/ajukan/verifikasi/",
+        {"nama": data["nama"], "nik": data["nik"], "alamat": data["alamat"]},
+    )
+    client.request("status_surat GET", "/warga/status/")
+
+    if ok:
+        with stats.lock:
+            stats.residents_done += 1
+
+
+def _staff_flow(base_url, stats, staff, password, done, rng):
+    """Staff membuka change form LetterRequest di admin dan mengubah statusnya."""
+    client = Client(base_url, stats)
+    client.login(staff.nik, password)
+    next_status = {
+        RequestStatus.DIPROSES: RequestStatus.DISETUJUI,
+        RequestStatus.DISETUJUI: RequestStatus.TELAH_DIAMBIL,
+    }
+    while not done.is_set():
+        ids = list(
+            LetterRequest.objects.filter(
+                nik__startswith=RESIDENT_NIK_PREFIX,
+                status__in=list(next_status),
+            ).values_list("id", "status")[:50]
+        )
+        if not ids:
+            time.sleep(0.05)
+            continue
+
+        pk, status = rng.choice(ids)
+        path = f"/admin/core/letterrequest/{pk}/change/"
+        client.request("admin change GET", path)
+        client.request("admin change POST", path, {"status": next_status[status], "_save": "Save"})
+
+
+class Command(BaseCommand):
+    help = (
+        "Uji beban lokal: banyak warga simulasi login dan mengajukan surat bersamaan, "
+        "sementara staff mengubah status lewat admin. Data uji memakai NIK berawalan 99/98 "
+        "dan dihapus setelah selesai (kecuali --keep)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--residents", type=int, default=50, help="Jumlah warga simulasi.")
+        parser.add_argument("--staff", type=int, default=2, help="Jumlah staff yang mengubah status.")
+        parser.add_argument("--concurrency", type=int, default=10, help="Jumlah warga yang jalan bersamaan.")
+        parser.add_argument(
+            "--base-url",
+            help=(
+                "Target server yang sudah jalan (mis. http://127.0.0.1:8000, bisa WSGI atau ASGI). "
+                "Default: server WSGI threaded di dalam proses ini."
+            ),
+        )
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument(
+            "--keep", action="store_true",
+            help="Jangan hapus akun & surat uji setelah selesai (password acak dicetak di output).",
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        # password acak per run: akun uji (juga staff) tidak bisa dipakai dari luar run ini
+        password = secrets.token_urlsafe(16)
+        residents, staff = self._seed_users(options["residents"], options["staff"], password)
+        try:
+            self._run(options, rng, residents, staff, password)
+        finally:
+            if options["keep"]:
+                self.stdout.write(f"Akun uji disimpan; password run ini: {password}")
+            else:
+                get_user_model().objects.filter(nik__regex=rf"^({RESIDENT_NIK_PREFIX}|{STAFF_NIK_PREFIX})").delete()
+
+    def _run(self, options, rng, residents, staff, password):
+        stats = Stats()
+
+        server = None
+        base_url = options["base_url"]
+        if base_url:
+            stats.locks_from_body = True
+        else:
+            server = ThreadedWSGIServer(("127.0.0.1", 0), _QuietHandler)
+            server.set_app(WSGIHandler())
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            base_url = f"http://127.0.0.1:{server.server_port}"
+            # hitung lock timeout langsung dari exception; traceback per request tidak perlu dicetak
+            got_request_exception.connect(self._lock_receiver(stats), weak=False, dispatch_uid="loadtest")
+            logging.getLogger("django.request").disabled = True
+
+        self.stdout.write(f"Target {base_url}: {len(residents)} warga, {len(staff)} staff, "
+                          f"concurrency {options['concurrency']}")
+
+        done = threading.Event()
+        staff_threads = [
+            threading.Thread(
+                target=_staff_flow, args=(base_url, stats, s, password, done, random.Random(rng.random())),
+            )
+            for s in staff
+        ]
+        started = time.perf_counter()
+        for t in staff_threads:
+            t.start()
+
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            futures = [
+                pool.submit(_resident_flow, base_url, stats, user, password, random.Random(rng.random()))
+                for user in residents
+            ]
+            for future in futures:
+                future.result()
+
+        done.set()
+        for t in staff_threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        if server:
+            server.shutdown()
+            server.server_close()
+            got_request_exception.disconnect(dispatch_uid="loadtest")
+            logging.getLogger("django.request").disabled = False
+
+        self._report(stats, elapsed)
+
+    @staticmethod
+    def _lock_receiver(stats):
+        def receiver(sender, request=None, **kwargs):
+            exc = sys.exc_info()[1]
+            if isinstance(exc, OperationalError) and "locked" in str(exc):
+                stats.lock_timeout()
+        return receiver
+
+    def _seed_users(self, n_residents, n_staff, password):
+        User = get_user_model()
+        hashed = make_password(password)  # hash sekali, dipakai semua akun uji
+
+        wanted = [
+            User(nik=f"{RESIDENT_NIK_PREFIX}{i:014d}", nama=f"Warga Uji {i}", password=hashed)
+            for i in range(n_residents)
+        ] + [
+            User(nik=f"{STAFF_NIK_PREFIX}{i:014d}", nama=f"Staff Uji {i}", password=hashed, is_staff=True)
+            for i in range(n_staff)
+        ]
+        User.objects.bulk_create(wanted, ignore_conflicts=True)
+
+        niks = [u.nik for u in wanted]
+        users = User.objects.filter(nik__in=niks)
+        # akun sisa run --keep sebelumnya ikut memakai password & hak akses run ini
+        users.update(password=hashed, is_superuser=False)
+
+        # staff uji hanya boleh mengubah surat, bukan superuser
+        staff_ids = list(users.filter(is_staff=True).values_list("id", flat=True))
+        change = Permission.objects.get(content_type__app_label="core", codename="change_letterrequest")
+        UserPermission = User.user_permissions.through
+        UserPermission.objects.bulk_create(
+            [UserPermission(user_id=pk, permission_id=change.pk) for pk in staff_ids], ignore_conflicts=True,
+        )
+
+        users = users.order_by("nik")
+        residents = [u for u in users if not u.is_staff]
+        staff = [u for u in users if u.is_staff]
+        return residents, staff
+
+    def _report(self, stats, elapsed):
+        total = sum(len(v) for v in stats.latencies.values())
+        errors = sum(stats.errors.values())
+
+        self.stdout.write("")
+        self.stdout.write(f"Durasi          : {elapsed:.2f} s")
+        self.stdout.write(f"Total request   : {total} ({total / elapsed:.1f} req/s)")
+        self.stdout.write(f"Warga selesai   : {stats.residents_done} ({stats.residents_done / elapsed:.1f} pengajuan/s)")
+        self.stdout.write(f"Error rate      : {errors}/{total} ({(errors / total * 100) if total else 0:.1f}%)")
+        self.stdout.write(f"Lock timeout    : {stats.lock_timeouts}")
+        self.stdout.write("")
+
+        header = f"{'endpoint':<28}{'n':>6}{'err':>6}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}  (ms)"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for endpoint, samples in sorted(stats.latencies.items()):
+            ms = sorted(s * 1000 for s in samples)
+            self.stdout.write(
+                f"{endpoint:<28}{len(ms):>6}{stats.errors.get(endpoint, 0):>6}"
+                f"{_pct(ms, 50):>8.0f}{_pct(ms, 95):>8.0f}{_pct(ms, 99):>8.0f}{ms[-1]:>8.0f}"
+            )
+
+        self.stdout.write("")
+        self.stdout.write("Histogram latensi (ms, jumlah request per bucket):")
+        labels = [f"<={b}" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"]
+        self.stdout.write(f"{'endpoint':<28}" + "".join(f"{label:>8}" for label in labels))
+        for endpoint, samples in sorted(stats.latencies.items()):
+            counts = [0] * (len(BUCKETS_MS) + 1)
+            for s in samples:
+                ms = s * 1000
+                index = next((i for i, b in enumerate(BUCKETS_MS) if ms <= b), len(BUCKETS_MS))
+                counts[index] += 1
+            self.stdout.write(f"{endpoint:<28}" + "".join(f"{c:>8}" for c in counts))
+
+
+def _pct(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
@@ -0,0 +1,158 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Dijalankan di proses Python baru (cold start), hasilnya dicetak sebagai JSON.
+# Memakai meta path finder sendiri, bukan `-X importtime`, karena modul yang
+# dimuat lewat importlib.import_module (settings, models, admin, dll.) tidak
+# tercatat oleh -X importtime.
+PROFILE_SCRIPT = r"""
+import json
+import sys
+import time
+
+records = {}
+stack = []
+
+
+class _TimedLoader:
+    def __init__(self, loader, name):
+        self._loader = loader
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def _timed(self, fn, *args):
+        start = time.perf_counter()
+        stack.append(0.0)
+        try:
+            return fn(*args)
+        finally:
+            children = stack.pop()
+            total = time.perf_counter() - start
+            if stack:
+                stack[-1] += total
+            prev_self, prev_total = records.get(self._name, (0.0, 0.0))
+            records[self._name] = (prev_self + total - children, prev_total + total)
+
+    def create_module(self, spec):
+        return self._timed(self._loader.create_module, spec)
+
+    def exec_module(self, module):
+        return self._timed(self._loader.exec_module, module)
+
+
+class _TimingFinder:
+    @classmethod
+    def find_spec(cls, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is cls or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, name)
+                return spec
+        return None
+
+
+sys.meta_path.insert(0, _TimingFinder)
+phases = {}
+
+start = time.perf_counter()
+import django
+django.setup()
+phases["django.setup()"] = time.perf_counter() - start
+
+from importlib import import_module
+from django.conf import settings
+
+start = time.perf_counter()
+import_module(settings.ROOT_URLCONF)
+phases["ROOT_URLCONF"] = time.perf_counter() - start
+
+print(json.dumps({
+    "phases": phases,
+    "modules": {name: list(times) for name, times in records.items()},
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Ukur biaya import per modul saat worker baru start (django.setup() + URLconf), "
+        "di proses Python terpisah supaya benar-benar cold start."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=20, help="Jumlah modul termahal yang ditampilkan.")
+        parser.add_argument("--repeat", type=int, default=3, help="Jumlah pengukuran; diambil median.")
+
+    def handle(self, *args, **options):
+        runs = [self._run_once() for _ in range(max(1, options["repeat"]))]
+
+        phases = {name: statistics.median(r["phases"][name] for r in runs) for name in runs[0]["phases"]}
+        modules = {}
+        for name in runs[0]["modules"]:
+            samples = [r["modules"][name] for r in runs if name in r["modules"]]
+            modules[name] = (
+                statistics.median(s[0] for s in samples),
+                statistics.median(s[1] for s in samples),
+            )
+
+        self.stdout.write(f"Median dari {len(runs)} cold start:")
+        for name, seconds in phases.items():
+            self.stdout.write(f"  {name:<20}{seconds * 1000:>10.1f} ms")
+
+        project = self._project_packages()
+        self._table(
+            "Modul proyek",
+            sorted(
+                ((n, t) for n, t in modules.items() if n.split(".")[0] in project),
+                key=lambda item: -item[1][1],
+            ),
+        )
+        self._table("Modul termahal (cumulative)", sorted(modules.items(), key=lambda item: -item[1][1])[: options["top"]])
+
+        by_package = {}
+        for name, (self_time, _) in modules.items():
+            package = name.split(".")[0]
+            by_package[package] = by_package.get(package, 0.0) + self_time
+        self.stdout.write("")
+        self.stdout.write("Total self time per paket teratas:")
+        for package, seconds in sorted(by_package.items(), key=lambda item: -item[1])[: options["top"]]:
+            self.stdout.write(f"  {package:<40}{seconds * 1000:>10.1f} ms")
+
+    def _run_once(self):
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(p for p in sys.path if p)
+        result = subprocess.run(
+            [sys.executable, "-c", PROFILE_SCRIPT],
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Gagal mengukur import:\n{result.stderr}")
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def _project_packages(self):
+        packages = {settings.SETTINGS_MODULE.split(".")[0], settings.ROOT_URLCONF.split(".")[0]}
+        for app in settings.INSTALLED_APPS:
+            if not app.startswith("django."):
+                packages.add(app.split(".")[0])
+        return packages
+
+    def _table(self, title, rows):
+        self.stdout.write("")
+        self.stdout.write(title)
+        self.stdout.write(f"  {'modul':<50}{'self (ms)':>12}{'cumulative (ms)':>18}")
+        for name, (self_time, total) in rows:
+            self.stdout.write(f"  {name:<50}{self_time * 1000:>12.2f}{total * 1000:>18.2f}")
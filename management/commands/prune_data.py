@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+
+from core.retention import chunk_size, database_size, object_sizes, prune, vacuum
+
+
+def _fmt(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+class Command(BaseCommand):
+    help = (
+        "Hapus data lama sesuai kebijakan retensi (RETENTION_* di settings) per potongan, "
+        "lalu rapikan database (incremental VACUUM / ANALYZE). Jadwalkan harian via cron/Task Scheduler."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Hanya hitung baris yang akan dihapus.")
+        parser.add_argument("--chunk-size", type=int, help="Baris per DELETE (default: RETENTION_CHUNK_SIZE).")
+        parser.add_argument("--no-vacuum", action="store_true", help="Lewati VACUUM/ANALYZE.")
+        parser.add_argument(
+            "--full-vacuum",
+            action="store_true",
+            help="SQLite: jalankan VACUUM penuh sekali kalau auto_vacuum belum INCREMENTAL (mengunci database).",
+        )
+        parser.add_argument("--top", type=int, default=15, help="Jumlah tabel/index terbesar yang ditampilkan.")
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        before_db, before = database_size(), object_sizes()
+
+        self.stdout.write("Baris yang akan dihapus:" if dry_run else "Baris dihapus:")
+        for label, n in prune(dry_run=dry_run, size=options["chunk_size"] or chunk_size()):
+            self.stdout.write(f"  {label:<40}{n:>10}")
+
+        if dry_run:
+            self._report(before_db, before, None, None, options["top"])
+            return
+
+        if not options["no_vacuum"]:
+            steps = vacuum(full=options["full_vacuum"])
+            for step in steps:
+                self.stdout.write(f"  {step}")
+            if before_db and len(steps) == 1:
+                self.stdout.write("  (auto_vacuum belum INCREMENTAL: jalankan sekali dengan --full-vacuum)")
+
+        self._report(before_db, before, database_size(), object_sizes(), options["top"])
+        self.stdout.write(self.style.SUCCESS("Selesai."))
+
+    def _report(self, before_db, before, after_db, after, top):
+        if before_db:
+            self.stdout.write("")
+            line = f"File database: {_fmt(before_db['total'])} (kosong {_fmt(before_db['free'])})"
+            if after_db:
+                line += f" -> {_fmt(after_db['total'])} (kosong {_fmt(after_db['free'])})"
+            self.stdout.write(line)
+
+        if not before:
+            return
+        self.stdout.write("")
+        self.stdout.write(f"  {'tabel / index':<45}{'sebelum':>12}{'sesudah':>12}")
+        for name, size in sorted(before.items(), key=lambda item: -item[1])[:top]:
+            after_size = _fmt(after.get(name, 0)) if after is not None else "-"
+            self.stdout.write(f"  {name:<45}{_fmt(size):>12}{after_size:>12}")
@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from core.notifications import digest_window, send_digests
+
+
+class Command(BaseCommand):
+    help = (
+        "Gabungkan perubahan status surat yang tertunda menjadi satu notifikasi per warga. "
+        "Dipakai kalau NOTIFICATION_DIGEST = True; jadwalkan berkala (mis. tiap 15 menit)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--window",
+            type=int,
+            help="Window dalam menit (default: NOTIFICATION_DIGEST_WINDOW_MINUTES).",
+        )
+
+    def handle(self, *args, **options):
+        window = timedelta(minutes=options["window"]) if options["window"] is not None else digest_window()
+        sent = send_digests(window=window)
+        self.stdout.write(self.style.SUCCESS(f"{sent} notifikasi digest dibuat."))
@@ -0,0 +1,46 @@
+from django.core.management import call_command, load_command_class
+from django.core.management import get_commands
+from django.core.management.base import BaseCommand, CommandError
+
+from core.tenancy import all_villages, has_own_database, use_village, village_by_slug, village_db_alias
+
+
+class Command(BaseCommand):
+    help = (
+        "Jalankan command lain sebagai satu desa atau semua desa, mis. "
+        "`village_run --all migrate` atau `village_run sukamaju prune_data --dry-run`. "
+        "Untuk command dengan opsi --database, database desa dipilih otomatis."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("village", nargs="?", help="Slug desa.")
+        parser.add_argument("--all", action="store_true", help="Semua desa aktif.")
+        parser.add_argument("command_name")
+        parser.add_argument("command_args", nargs="...")
+
+    def handle(self, *args, **options):
+        if options["all"] == bool(options["village"]):
+            raise CommandError("Sebutkan slug desa atau --all (salah satu).")
+
+        if options["all"]:
+            villages = all_villages()
+        else:
+            village = village_by_slug(options["village"])
+            if village is None:
+                raise CommandError(f"Desa '{options['village']}' tidak ditemukan / tidak aktif.")
+            villages = [village]
+
+        name = options["command_name"]
+        if name not in get_commands():
+            raise CommandError(f"Command '{name}' tidak dikenal.")
+        accepts_database = "database" in {
+            action.dest for action in load_command_class(get_commands()[name], name).create_parser("", name)._actions
+        }
+
+        for village in villages:
+            extra = {}
+            if accepts_database and has_own_database(village):
+                extra["database"] = village_db_alias(village)
+            self.stdout.write(self.style.MIGRATE_HEADING(f"== {village.nama} ({village.slug}) =="))
+            with use_village(village):
+                call_command(name, *options["command_args"], stdout=self.stdout, stderr=self.stderr, **extra)
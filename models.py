@@ -1,4 +1,10 @@
-from django.db import models
+import hashlib
+import json
+from collections import Counter
+
+from django.db import models, router, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.core.validators import RegexValidator
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 from django.conf import settings
@@ -32,6 +38,37 @@ wa_validator = RegexValidator(
 )
 
 
+# ==========================
+# DESA (multi-tenant)
+# ==========================
+
+class Village(models.Model):
+    """
+    Satu desa dalam deployment bersama (lihat core/tenancy.py). Selalu disimpan di
+    database utama; data warga desa bisa di database utama atau database sendiri.
+    """
+    nama = models.CharField(max_length=100)
+    slug = models.SlugField(unique=True, help_text="Dipakai di URL /desa/<slug>/")
+    domain = models.CharField(max_length=253, blank=True, db_index=True, help_text="Contoh: sukamaju.desa.id")
+    database_name = models.CharField(
+        max_length=63,
+        blank=True,
+        help_text="Kosong = database utama. Diisi = file SQLite / schema PostgreSQL sendiri.",
+    )
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.nama
+
+
+def _village_fk():
+    # tanpa constraint: baris di database desa menunjuk Village di database utama
+    return models.ForeignKey(
+        Village, on_delete=models.DO_NOTHING, null=True, blank=True, db_constraint=False, related_name="+",
+    )
+
+
 class User(AbstractBaseUser, PermissionsMixin):
     nik = models.CharField(max_length=16, unique=True, validators=[nik_validator])
     nama = models.CharField(max_length=100)
@@ -47,6 +84,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
 
+    village = _village_fk()
+
     USERNAME_FIELD = "nik"
     REQUIRED_FIELDS = ["nama"]
 
@@ -74,6 +113,104 @@ class RequestStatus(models.TextChoices):
     DITOLAK = "DITOLAK", "Ditolak"
 
 
+def normalize_payload(payload):
+    """Bentuk JSON kanonik (key terurut, tanpa spasi) sebagai dasar hash PayloadBlob."""
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def payload_digest(payload):
+    return hashlib.sha256(normalize_payload(payload).encode()).hexdigest()
+
+
+class PayloadBlobManager(models.Manager):
+    def intern_many(self, payloads):
+        """
+        Blob untuk setiap payload (urutan sama dengan input), dibuat kalau belum ada,
+        dan ref_count ditambah sesuai jumlah pemakaian. Jumlah query tetap,
+        berapa pun banyaknya payload.
+        """
+        digests = [payload_digest(p) for p in payloads]
+        if not digests:
+            return []
+
+        existing = self.in_bulk(set(digests), field_name="digest")
+        missing = {}
+        for digest, payload in zip(digests, payloads):
+            if digest not in existing:
+                missing.setdefault(digest, payload)
+        if missing:
+            self.bulk_create(
+                [self.model(digest=d, data=p) for d, p in missing.items()],
+                ignore_conflicts=True,  # blob yang sama bisa dibuat request lain bersamaan
+            )
+            existing = self.in_bulk(set(digests), field_name="digest")
+
+        uses = Counter(digests)
+        by_increment = {}
+        for digest, n in uses.items():
+            by_increment.setdefault(n, []).append(existing[digest].pk)
+        for n, ids in by_increment.items():
+            self.filter(pk__in=ids).update(ref_count=F("ref_count") + n)
+
+        return [existing[d] for d in digests]
+
+    def intern(self, payload):
+        return self.intern_many([payload])[0]
+
+    def release(self, blob_id):
+        self.release_many([blob_id])
+
+    def release_many(self, blob_ids):
+        """
+        Kebalikan intern_many: ref_count dikurangi sesuai jumlah kemunculan id di
+        `blob_ids` (tidak pernah di bawah 0). Satu UPDATE per besar pengurangan.
+        """
+        by_decrement = {}
+        for blob_id, n in Counter(i for i in blob_ids if i is not None).items():
+            by_decrement.setdefault(n, []).append(blob_id)
+        for n, ids in by_decrement.items():
+            self.filter(pk__in=ids).update(ref_count=Greatest(F("ref_count") - n, 0))
+
+    def unreferenced(self):
+        return self.filter(ref_count=0)
+
+
+class PayloadBlob(models.Model):
+    """
+    Isi payload surat, disimpan sekali untuk isi yang sama (content-addressed, key = sha256
+    dari JSON kanonik). Pengajuan ulang dengan data yang sama memakai blob yang sama;
+    ref_count = jumlah LetterRequest yang menunjuk ke blob ini.
+    """
+    digest = models.CharField(max_length=64, unique=True)
+    data = models.JSONField(default=dict)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = PayloadBlobManager()
+
+    def __str__(self):
+        return f"{self.digest[:12]} ({self.ref_count})"
+
+
+# kolom snapshot LetterRequest yang juga ada di payload form; tidak disimpan ulang di blob
+PAYLOAD_COLUMN_FIELDS = ("nama", "nik", "alamat")
+
+
+class LetterRequestQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create tidak memanggil save(), jadi payload di-intern di sini sekaligus
+        objs = list(objs)
+        pending = [obj for obj in objs if obj._pending_payload is not None]
+        with transaction.atomic(using=self.db):
+            blobs = PayloadBlob.objects.intern_many([obj._blob_data() for obj in pending])
+            for obj, blob in zip(pending, blobs):
+                obj.payload_blob = blob
+            created = super().bulk_create(objs, *args, **kwargs)
+        for obj in pending:
+            obj._pending_payload = None
+        return created
+
+
 class LetterRequest(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="letter_requests")
 
@@ -85,15 +222,74 @@ class LetterRequest(models.Model):
     nik = models.CharField(max_length=16, validators=[nik_validator])
     alamat = models.TextField()
 
-    # data detail beda-beda tiap surat
-    payload = models.JSONField(default=dict)
+    # data detail beda-beda tiap surat (lihat property `payload`)
+    payload_blob = models.ForeignKey(
+        PayloadBlob, on_delete=models.PROTECT, null=True, blank=True, related_name="letter_requests",
+    )
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # diisi saat surat dicetak dari antrian cetak (lihat core/printing.py)
+    printed_at = models.DateTimeField(null=True, blank=True)
+
+    village = _village_fk()
+
+    objects = LetterRequestQuerySet.as_manager()
+
+    _pending_payload = None
+
+    class Meta:
+        indexes = [
+            # filter + urutan di halaman status_surat
+            models.Index(fields=["user", "letter_type", "status", "created_at"], name="core_lr_user_type_status"),
+            # status_surat tanpa filter: urut created_at milik satu warga
+            models.Index(fields=["user", "created_at"], name="core_lr_user_created"),
+            # antrian cetak: status + tanggal
+            models.Index(fields=["status", "updated_at"], name="core_lr_status_updated"),
+        ]
+
     def __str__(self):
         return f"{self.nik} - {self.letter_type} - {self.status}"
 
+    @property
+    def payload(self):
+        if self._pending_payload is not None:
+            return self._pending_payload
+        if not self.payload_blob_id:
+            return {}
+        return {**{name: getattr(self, name) for name in PAYLOAD_COLUMN_FIELDS}, **self.payload_blob.data}
+
+    @payload.setter
+    def payload(self, value):
+        # disimpan ke PayloadBlob saat save() / bulk_create()
+        self._pending_payload = value
+
+    def _blob_data(self):
+        # nama/nik/alamat yang sama dengan kolom dibuang, supaya warga berbeda dengan
+        # jawaban form yang sama memakai blob yang sama (dikembalikan lagi oleh `payload`)
+        return {
+            key: value for key, value in self._pending_payload.items()
+            if not (key in PAYLOAD_COLUMN_FIELDS and value == getattr(self, key))
+        }
+
+    def save(self, *args, **kwargs):
+        if self._pending_payload is None:
+            return super().save(*args, **kwargs)
+
+        # intern blob + simpan surat dalam satu transaksi: kalau simpan gagal, ref_count ikut batal
+        old_blob_id = self.payload_blob_id
+        try:
+            with transaction.atomic(using=kwargs.get("using") or router.db_for_write(type(self), instance=self)):
+                self.payload_blob = PayloadBlob.objects.intern(self._blob_data())
+                if old_blob_id:
+                    PayloadBlob.objects.release(old_blob_id)
+                super().save(*args, **kwargs)
+        except Exception:
+            self.payload_blob_id = old_blob_id
+            raise
+        self._pending_payload = None
+
 
 class Notification(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="notifications")
@@ -102,5 +298,28 @@ class Notification(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
 
+    village = _village_fk()
+
     def __str__(self):
         return f"{self.user.nik} - {self.title}"
+
+
+class StatusChange(models.Model):
+    """
+    Perubahan status yang belum dikirim sebagai notifikasi (mode digest).
+    Dikumpulkan per warga lalu digabung jadi satu Notification oleh
+    command `send_notification_digest`.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="status_changes")
+    letter_request = models.ForeignKey(LetterRequest, on_delete=models.CASCADE, related_name="status_changes")
+    status = models.CharField(max_length=20, choices=RequestStatus.choices)
+    created_at = models.DateTimeField(auto_now_add=True)
+    digested_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["digested_at", "user", "created_at"], name="core_statuschange_pending"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.letter_request_id} - {self.status}"
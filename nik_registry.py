@@ -0,0 +1,12 @@
+# core/nik_registry.py
+# Cek "NIK sudah terdaftar?" untuk form daftar dan endpoint cek-nik.
+#
+# Sengaja langsung ke database (satu lookup di index unique `nik`), tanpa cache:
+# cache per proses (LocMem) bisa basi saat warga mendaftar lewat worker lain, dan
+# jawaban "NIK bisa dipakai" untuk NIK yang sudah terdaftar tidak boleh terjadi.
+# Constraint unique tetap jadi penentu akhir saat insert (lihat daftar_warga).
+from django.contrib.auth import get_user_model
+
+
+def is_registered(nik):
+    return get_user_model().objects.filter(nik=nik).exists()
@@ -0,0 +1,199 @@
+# core/notifications.py
+# Pembuatan notifikasi status surat: langsung (default) atau digest per warga.
+import contextvars
+import logging
+import queue
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, router, transaction
+from django.db.models import F, Max, Min
+from django.utils import timezone
+
+from .models import LetterType, Notification, RequestStatus, StatusChange
+
+
+DEFAULT_DIGEST_WINDOW_MINUTES = 60
+
+logger = logging.getLogger(__name__)
+
+
+def _message_for(status, letter_label):
+    """(title, message) untuk satu perubahan status, atau None kalau status ini tidak dinotifikasi."""
+    if status == RequestStatus.DISETUJUI:
+        return (
+            "Surat Disetujui",
+            "Surat kamu telah disetujui. Silahkan datang ke kantor desa untuk mengambil surat. "
+            "Harap membawa KTP atau KK sebagai bukti pengambilan.",
+        )
+    if status == RequestStatus.TELAH_DIAMBIL:
+        return ("Surat Telah Diambil", f"{letter_label} - Telah Diambil.")
+    return None
+
+
+def digest_enabled():
+    return getattr(settings, "NOTIFICATION_DIGEST", False)
+
+
+def digest_window():
+    minutes = getattr(settings, "NOTIFICATION_DIGEST_WINDOW_MINUTES", DEFAULT_DIGEST_WINDOW_MINUTES)
+    return timedelta(minutes=minutes)
+
+
+def notify_status_change(lr):
+    """
+    Dipanggil setiap status LetterRequest berubah.
+    Mode biasa: langsung buat Notification. Mode digest: simpan StatusChange,
+    nanti digabung oleh `send_notification_digest`.
+    """
+    if digest_enabled():
+        # semua perubahan dicatat (termasuk DITOLAK), supaya digest memuat status terakhir yang benar
+        StatusChange.objects.create(user_id=lr.user_id, letter_request=lr, status=lr.status)
+        return
+
+    notice = _message_for(lr.status, lr.get_letter_type_display())
+    if notice is None:
+        return
+    title, message = notice
+    Notification.objects.create(user_id=lr.user_id, title=title, message=message)
+
+
+def _digest_notification(user_id, changes):
+    """
+    Satu Notification untuk semua perubahan milik satu warga (status terakhir per surat),
+    atau None. Surat ikut dilaporkan kalau salah satu perubahannya dinotifikasi di mode
+    biasa; mis. disetujui lalu ditolak dalam satu window dilaporkan "Ditolak".
+    """
+    latest, notified = {}, set()
+    for change in changes:  # urut created_at, jadi yang terakhir menang
+        latest[change.letter_request_id] = change
+        if _message_for(change.status, change.letter_type_label) is not None:
+            notified.add(change.letter_request_id)
+    latest = {pk: change for pk, change in latest.items() if pk in notified}
+
+    if not latest:
+        return None
+    if len(latest) == 1:
+        change = next(iter(latest.values()))
+        title, message = _message_for(change.status, change.letter_type_label) or (
+            f"Surat {change.get_status_display()}",
+            f"{change.letter_type_label} - {change.get_status_display()}.",
+        )
+        return Notification(user_id=user_id, title=title, message=message)
+
+    lines = [f"{c.letter_type_label} - {c.get_status_display()}" for c in latest.values()]
+    return Notification(
+        user_id=user_id,
+        title=f"Update Status Surat ({len(latest)})",
+        message="\n".join(lines),
+    )
+
+
+def send_digests(window=None, now=None):
+    """
+    Gabungkan StatusChange yang tertunda jadi satu Notification per warga.
+
+    Warga diproses kalau perubahan tertuanya sudah melewati window, supaya
+    perubahan yang berdekatan ikut tergabung. Mengembalikan jumlah notifikasi.
+    """
+    window = digest_window() if window is None else window
+    now = now or timezone.now()
+
+    pending = StatusChange.objects.filter(digested_at__isnull=True)
+    due = (
+        pending.values("user_id")
+        .annotate(first=Min("created_at"), last_id=Max("id"))
+        .filter(first__lte=now - window)
+    )
+    last_id_by_user = {row["user_id"]: row["last_id"] for row in due}
+    if not last_id_by_user:
+        return 0
+
+    max_id = max(last_id_by_user.values())
+    label_by_type = dict(LetterType.choices)
+    changes = (
+        pending.filter(user_id__in=last_id_by_user, id__lte=max_id)
+        .annotate(letter_type=F("letter_request__letter_type"), village_id=F("user__village_id"))
+        .order_by("user_id", "created_at", "id")
+    )
+
+    by_user = {}
+    for change in changes:
+        change.letter_type_label = label_by_type.get(change.letter_type, change.letter_type)
+        by_user.setdefault(change.user_id, []).append(change)
+
+    notifications = []
+    for user_id, rows in by_user.items():
+        notification = _digest_notification(user_id, rows)
+        if notification is not None:
+            notification.village_id = rows[0].village_id  # bulk_create tidak lewat signal pre_save
+            notifications.append(notification)
+
+    with transaction.atomic(using=router.db_for_write(Notification)):
+        Notification.objects.bulk_create(notifications)
+        pending.filter(user_id__in=last_id_by_user, id__lte=max_id).update(digested_at=now)
+
+    return len(notifications)
+
+
+# ==========================
+# ANTRIAN PENGIRIMAN
+# ==========================
+# Pesan yang tidak perlu ditunggu oleh request (mis. selamat datang setelah daftar)
+# dikirim oleh satu worker thread, setelah transaksi yang membuatnya commit.
+
+_queue = queue.Queue()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def _run_worker():
+    while True:
+        fn, args = _queue.get()
+        try:
+            fn(*args)
+        except Exception:
+            logger.exception("Gagal mengirim pesan antrian %s", getattr(fn, "__name__", fn))
+        finally:
+            close_old_connections()
+            _queue.task_done()
+
+
+def _put(fn, args):
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run_worker, name="notification-queue", daemon=True)
+            _worker.start()
+    _queue.put((fn, args))
+
+
+def _queue_db():
+    # database desa aktif kalau punya database sendiri (core/tenancy.py)
+    return router.db_for_write(Notification)
+
+
+def enqueue(fn, *args):
+    """
+    Jalankan fn(*args) di luar request, setelah transaksi saat ini commit.
+    NOTIFICATION_QUEUE_ASYNC = False menjalankannya langsung saat commit (dipakai di test).
+    """
+    if getattr(settings, "NOTIFICATION_QUEUE_ASYNC", True):
+        # worker thread memakai context request ini (mis. desa aktif, lihat core/tenancy.py)
+        context = contextvars.copy_context()
+        transaction.on_commit(lambda: _put(context.run, (fn, *args)), using=_queue_db())
+    else:
+        transaction.on_commit(lambda: fn(*args), using=_queue_db())
+
+
+def deliver_welcome(user_id):
+    Notification.objects.create(
+        user_id=user_id,
+        title="Selamat Datang",
+        message="Akun kamu berhasil dibuat. Sekarang kamu bisa mengajukan surat dan cek statusnya dari sini.",
+    )
+
+
+def queue_welcome(user):
+    enqueue(deliver_welcome, user.pk)
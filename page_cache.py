@@ -0,0 +1,119 @@
+# core/page_cache.py
+# Cache HTML untuk halaman yang hampir selalu sama (home, login, pilih surat, beranda warga).
+#
+# Key cache: nama view + role (anon/warga/staff) + id user + versi. Versi dinaikkan
+# untuk membuang cache: per user (mis. nama/NIK berubah, lihat signals.py) atau
+# global (mis. setelah deploy template baru, `invalidate_all_pages()`).
+#
+# Token CSRF tidak ikut disimpan: saat disimpan diganti placeholder, dan saat
+# disajikan diisi token baru dari get_token(request), jadi cookie CSRF tetap valid.
+import re
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+
+
+DEFAULT_TIMEOUT = 60 * 10
+VERSION_TIMEOUT = None  # versi tidak boleh kedaluwarsa sebelum halamannya
+
+CSRF_PLACEHOLDER = "__core_csrf_token__"
+CSRF_INPUT_RE = re.compile(r'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+CACHEABLE_STATUS = (200, 301, 302)
+
+GLOBAL_VERSION_KEY = "core:page:v"
+
+
+def _user_version_key(user_id):
+    return f"core:page:v:{user_id}"
+
+
+def _enabled():
+    return getattr(settings, "PAGE_CACHE_ENABLED", True)
+
+
+def _timeout():
+    return getattr(settings, "PAGE_CACHE_SECONDS", DEFAULT_TIMEOUT)
+
+
+def _role(user):
+    if not user.is_authenticated:
+        return "anon"
+    return "staff" if user.is_staff else "warga"
+
+
+def _page_key(request, name):
+    user = request.user
+    version_keys = [GLOBAL_VERSION_KEY]
+    if user.is_authenticated:
+        version_keys.append(_user_version_key(user.pk))
+    versions = cache.get_many(version_keys)
+    return "core:page:{}:{}:{}:{}:{}".format(
+        name,
+        _role(user),
+        user.pk or 0,
+        versions.get(GLOBAL_VERSION_KEY, 0),
+        versions.get(_user_version_key(user.pk), 0) if user.is_authenticated else 0,
+    )
+
+
+def _serve(request, entry):
+    status, headers, content = entry
+    if CSRF_PLACEHOLDER in content:
+        content = content.replace(CSRF_PLACEHOLDER, get_token(request))
+    response = HttpResponse(content, status=status)
+    for name, value in headers:
+        response[name] = value
+    return response
+
+
+def _store(key, response):
+    if response.status_code not in CACHEABLE_STATUS or response.cookies or response.streaming:
+        return
+    if response.has_header("Cache-Control") and "private" in response["Cache-Control"]:
+        return
+    content = response.content.decode(response.charset)
+    content = CSRF_INPUT_RE.sub(r"\g<1>" + CSRF_PLACEHOLDER + r"\g<2>", content)
+    headers = [(name, response[name]) for name in ("Content-Type", "Location") if response.has_header(name)]
+    cache.set(key, (response.status_code, headers, content), _timeout())
+
+
+def cached_page(view):
+    """Cache hasil GET sebuah view per role/user. Request selain GET tidak disentuh."""
+    name = f"{view.__module__}.{view.__name__}"
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method != "GET" or request.GET or not _enabled():
+            return view(request, *args, **kwargs)
+
+        key = _page_key(request, name)
+        entry = cache.get(key)
+        if entry is not None:
+            return _serve(request, entry)
+
+        response = view(request, *args, **kwargs)
+        if hasattr(response, "render") and callable(response.render):
+            response = response.render()
+        _store(key, response)
+        return response
+    return wrapper
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, VERSION_TIMEOUT)
+
+
+def invalidate_user_pages(user_id):
+    """Buang semua halaman ter-cache milik satu user."""
+    _bump(_user_version_key(user_id))
+
+
+def invalidate_all_pages():
+    """Buang semua halaman ter-cache (mis. setelah template/menu berubah)."""
+    _bump(GLOBAL_VERSION_KEY)
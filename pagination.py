@@ -0,0 +1,110 @@
+# core/pagination.py
+from django.conf import settings
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+DEFAULT_ESTIMATE_THRESHOLD = 10_000
+
+
+class CountedPaginator(Paginator):
+    """
+    Paginator yang bisa diberi jumlah baris yang sudah diketahui (mis. dari cache),
+    supaya tidak menjalankan COUNT(*) lagi. count=None -> perilaku Paginator biasa.
+
+    Jumlah dari cache bisa basi (mis. surat dibuat lewat worker lain), jadi halaman
+    diambil dengan satu baris ekstra. Kalau isinya tidak cocok dengan jumlah itu
+    (atau nomor halaman di luar jumlah itu), dihitung ulang dengan COUNT(*) dan
+    `stale` menjadi True.
+    """
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.stale = False
+        self._given_count = count is not None
+        if count is not None:
+            self.__dict__["count"] = count  # isi cached_property Paginator.count
+
+    def _recount(self):
+        if not self._given_count:
+            return False
+        self._given_count = False
+        self.stale = True
+        self.__dict__.pop("count", None)
+        self.__dict__.pop("num_pages", None)
+        return True
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if not self._recount():
+                raise
+            return super().validate_number(number)
+
+    def page(self, number):
+        if not self._given_count:
+            return super().page(number)
+
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        if top + self.orphans >= self.count:
+            top = self.count
+        rows = list(self.object_list[bottom:top + 1])
+        expected = top - bottom + (1 if top < self.count else 0)
+        if len(rows) != expected and self._recount():
+            return super().page(min(number, self.num_pages))
+        return self._get_page(rows[:top - bottom], number, self)
+
+
+def estimate_row_count(model, using="default"):
+    """
+    Perkiraan jumlah baris tabel dari statistik database (tanpa COUNT(*)).
+    None kalau backend tidak punya statistik yang bisa dipakai.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+        elif connection.vendor == "mysql":
+            cursor.execute(
+                "SELECT table_rows FROM information_schema.tables "
+                "WHERE table_schema = DATABASE() AND table_name = %s",
+                [table],
+            )
+        elif connection.vendor == "sqlite":
+            # sqlite_stat1 hanya ada setelah ANALYZE (prune_data menjalankannya); tanpa itu
+            # pakai COUNT(*) biasa. MAX(rowid) tidak dipakai: setelah banyak baris dihapus
+            # angkanya jauh di atas jumlah sebenarnya dan halaman terakhir jadi kosong.
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if not cursor.fetchone():
+                return None
+            cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table])
+            row = cursor.fetchone()
+            return int(row[0].split()[0]) if row else None
+        else:
+            return None
+        row = cursor.fetchone()
+    return int(row[0]) if row and row[0] is not None and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Untuk changelist tabel besar: kalau queryset tidak difilter dan perkiraan jumlah
+    baris melewati ADMIN_ESTIMATED_COUNT_THRESHOLD, pakai perkiraan dari statistik
+    tabel. Tabel kecil atau queryset yang difilter tetap memakai COUNT(*) biasa.
+    """
+
+    @cached_property
+    def count(self):
+        qs = self.object_list
+        query = getattr(qs, "query", None)
+        if query is not None and not query.where:
+            threshold = getattr(settings, "ADMIN_ESTIMATED_COUNT_THRESHOLD", DEFAULT_ESTIMATE_THRESHOLD)
+            estimate = estimate_row_count(qs.model, qs.db)
+            if estimate is not None and estimate > threshold:
+                return estimate
+        return super().count
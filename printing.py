@@ -0,0 +1,200 @@
+# core/printing.py
+# Antrian cetak: semua surat DISETUJUI pada satu tanggal dicetak sekaligus.
+#
+# Data surat diambil dengan values() (tanpa membuat objek model), dipecah per
+# PRINT_BATCH_SIZE surat, lalu dirender ke HTML di ProcessPoolExecutor supaya
+# render ratusan surat tidak menahan worker web. Batch dikirim ke pool bertahap
+# (paling banyak 2x PRINT_WORKERS yang menunggu), hasilnya di-stream berurutan, dan
+# setelah dokumen selesai terkirim semua surat ditandai dicetak dengan satu UPDATE.
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.forms.utils import pretty_name
+from django.utils import timezone
+from django.utils.formats import date_format
+
+from .letter_render import document_head, document_tail, render_letters
+from .models import PAYLOAD_COLUMN_FIELDS, LetterRequest, LetterType, RequestStatus
+from .tenancy import scope_queryset
+
+
+DEFAULT_WORKERS = 2
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_KOP = "Pemerintah Desa"
+
+_executor = None
+_executor_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+def _workers():
+    return getattr(settings, "PRINT_WORKERS", DEFAULT_WORKERS)
+
+
+def _batch_size():
+    return getattr(settings, "PRINT_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=_workers())
+        return _executor
+
+
+def _reset_executor(broken):
+    """Buang pool yang rusak (mis. worker mati kena OOM); request berikutnya membuat pool baru."""
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _render_in_pool(batches):
+    """
+    HTML per batch, urut sesuai `batches`. Batch baru diambil (dan di-query) hanya
+    kalau antrian pool belum penuh, jadi dokumen mulai terkirim sebelum seluruh
+    antrian cetak dibaca. Kalau pool rusak, sisa batch dirender di proses ini.
+    """
+    executor = _get_executor()
+    limit = max(1, _workers() * 2)
+    pending = deque()  # (future, batch)
+    unsent = None
+    try:
+        while True:
+            while len(pending) < limit:
+                unsent = next(batches, None)
+                if unsent is None:
+                    break
+                pending.append((executor.submit(render_letters, unsent), unsent))
+                unsent = None
+            if not pending:
+                return
+            yield pending[0][0].result()
+            pending.popleft()
+    except BrokenProcessPool:
+        logger.warning("Pool render cetak rusak; dibuat ulang, sisa dokumen dirender langsung.")
+        _reset_executor(executor)
+        rest = [batch for _, batch in pending] + ([unsent] if unsent is not None else [])
+        pending.clear()
+        for batch in rest:
+            yield render_letters(batch)
+        for batch in batches:
+            yield render_letters(batch)
+    finally:
+        for future, _ in pending:
+            future.cancel()
+
+
+def print_queue(day, include_printed=False):
+    """Surat DISETUJUI desa aktif yang terakhir diubah pada tanggal `day` (zona waktu lokal)."""
+    start = datetime.combine(day, time.min, tzinfo=timezone.get_current_timezone())
+    queue = scope_queryset(LetterRequest.objects.all()).filter(
+        status=RequestStatus.DISETUJUI,
+        updated_at__gte=start,
+        updated_at__lt=start + timedelta(days=1),
+    )
+    if not include_printed:
+        queue = queue.filter(printed_at__isnull=True)
+    return queue
+
+
+def _field_specs():
+    """{letter_type: [(nama field, label, pilihan)]} dari form surat, urut sesuai form."""
+    from .views import FORM_BY_TYPE
+
+    specs = {}
+    for letter_type, form_cls in FORM_BY_TYPE.items():
+        specs[letter_type] = [
+            (name, field.label or pretty_name(name), dict(getattr(field, "choices", None) or ()))
+            for name, field in form_cls.base_fields.items()
+        ]
+    return specs
+
+
+def _display(value, choices):
+    if choices:
+        return choices.get(value, value)
+    if isinstance(value, str) and len(value) == 10:
+        try:
+            return date_format(date.fromisoformat(value), "j F Y")
+        except ValueError:
+            pass
+    return value
+
+
+def _letter_data(row, specs, tanggal, kop):
+    payload = {}
+    if row["payload_blob__data"] is not None:
+        # nama/nik/alamat tidak disimpan di blob kalau sama dengan kolom (lihat LetterRequest.payload)
+        payload = {**{name: row[name] for name in PAYLOAD_COLUMN_FIELDS}, **row["payload_blob__data"]}
+    rows = [
+        (label, _display(payload[name], choices))
+        for name, label, choices in specs.get(row["letter_type"], [])
+        if payload.get(name) not in (None, "")
+    ]
+    if not rows:
+        rows = [("Nama", row["nama"]), ("NIK", row["nik"]), ("Alamat", row["alamat"])]
+    return {
+        "id": row["id"],
+        "judul": LetterType(row["letter_type"]).label,
+        "nomor": f"{row['id']:05d}/{row['letter_type']}/{timezone.localtime(row['updated_at']):%m/%Y}",
+        "tanggal": tanggal,
+        "desa": kop,
+        "rows": rows,
+    }
+
+
+def _batches(queue, day, printed_ids):
+    specs = _field_specs()
+    tanggal = date_format(day, "j F Y")
+    kop = getattr(settings, "PRINT_KOP", DEFAULT_KOP)
+    size = _batch_size()
+
+    rows = (
+        queue.order_by("letter_type", "id")
+        .values("id", "letter_type", "nama", "nik", "alamat", "updated_at", "payload_blob__data")
+        .iterator(chunk_size=size)
+    )
+    batch = []
+    for row in rows:
+        batch.append(_letter_data(row, specs, tanggal, kop))
+        printed_ids.append(row["id"])
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def mark_printed(ids):
+    if not ids:
+        return 0
+    # update() tidak menyentuh updated_at, jadi surat tetap ada di antrian tanggal yang sama
+    return scope_queryset(LetterRequest.objects.filter(id__in=ids)).update(printed_at=timezone.now())
+
+
+def stream_print_document(queue, day):
+    """Generator HTML satu dokumen multi-halaman; dipakai StreamingHttpResponse."""
+    printed_ids = []
+    yield document_head(f"Cetak surat {day.isoformat()}")
+
+    batches = _batches(queue, day, printed_ids)
+    if _workers() > 0:
+        chunks = _render_in_pool(batches)
+    else:
+        chunks = map(render_letters, batches)
+    for chunk in chunks:
+        yield chunk
+
+    yield document_tail()
+    # hanya kalau seluruh dokumen terkirim (klien putus di tengah = tidak ditandai)
+    mark_printed(printed_ids)
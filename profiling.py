@@ -0,0 +1,137 @@
+# core/profiling.py
+# Profiling request lambat di production (opt-in lewat settings.PROFILING_ENABLED).
+#
+# Sebagian kecil request (PROFILING_SAMPLE_RATE) dijalankan di bawah cProfile; yang
+# durasinya >= PROFILING_THRESHOLD_MS disimpan. Staff bisa memaksa profiling satu
+# request dengan header "X-Profile: 1". Hasil disimpan di PROFILING_DIR sebagai
+# ring buffer (PROFILING_MAX_FILES file terbaru) dan bisa dilihat di /staff/profil/.
+import cProfile
+import json
+import pstats
+import random
+import re
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+
+DEFAULT_SAMPLE_RATE = 0.05
+DEFAULT_THRESHOLD_MS = 500
+DEFAULT_MAX_FILES = 50
+
+# cProfile memakai hook profiler global (sys.monitoring di Python 3.12+),
+# jadi hanya satu request yang diprofil dalam satu waktu.
+_profile_lock = threading.Lock()
+_store_lock = threading.Lock()
+
+PROFILE_ID_RE = re.compile(r"^\d+$")
+
+
+def profile_dir():
+    return Path(getattr(settings, "PROFILING_DIR", Path(settings.BASE_DIR) / "profiles"))
+
+
+def _max_files():
+    return getattr(settings, "PROFILING_MAX_FILES", DEFAULT_MAX_FILES)
+
+
+class SlowRequestProfilerMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILING_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "PROFILING_SAMPLE_RATE", DEFAULT_SAMPLE_RATE)
+        self.threshold_ms = getattr(settings, "PROFILING_THRESHOLD_MS", DEFAULT_THRESHOLD_MS)
+
+    def _forced(self, request):
+        # request.user hanya disentuh kalau header ada (tidak menambah query di request biasa)
+        if request.headers.get("X-Profile") != "1":
+            return False
+        user = getattr(request, "user", None)
+        return user is not None and user.is_staff
+
+    def __call__(self, request):
+        forced = self._forced(request)
+        if not forced and random.random() >= self.sample_rate:
+            return self.get_response(request)
+        if not _profile_lock.acquire(blocking=False):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        try:
+            started = time.perf_counter()
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+            duration_ms = (time.perf_counter() - started) * 1000
+        finally:
+            _profile_lock.release()
+
+        if forced or duration_ms >= self.threshold_ms:
+            store_profile(profiler, {
+                "method": request.method,
+                "path": request.get_full_path(),
+                "status": response.status_code,
+                "duration_ms": round(duration_ms, 1),
+                "forced": forced,
+                "created": time.time(),
+            })
+        return response
+
+
+def store_profile(profiler, meta):
+    """Simpan satu profil (.prof + .json) lalu buang yang paling lama di luar batas ring buffer."""
+    directory = profile_dir()
+    with _store_lock:
+        directory.mkdir(parents=True, exist_ok=True)
+        profile_id = str(time.time_ns())
+        profiler.dump_stats(directory / f"{profile_id}.prof")
+        (directory / f"{profile_id}.json").write_text(json.dumps(meta), encoding="utf-8")
+
+        for old in sorted(directory.glob("*.prof"))[: -_max_files()]:
+            old.unlink(missing_ok=True)
+            old.with_suffix(".json").unlink(missing_ok=True)
+    return profile_id
+
+
+def list_profiles():
+    """Profil tersimpan, terbaru dulu."""
+    profiles = []
+    for path in sorted(profile_dir().glob("*.json"), reverse=True):
+        try:
+            meta = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        meta["id"] = path.stem
+        profiles.append(meta)
+    return profiles
+
+
+def profile_path(profile_id):
+    if not PROFILE_ID_RE.match(profile_id or ""):
+        return None
+    path = profile_dir() / f"{profile_id}.prof"
+    return path if path.exists() else None
+
+
+def top_functions(path, limit=25, sort="cumulative"):
+    """Fungsi teratas dari file .prof, sebagai list dict untuk template."""
+    stats = pstats.Stats(str(path))
+    stats.sort_stats(sort)
+    rows = []
+    for func in stats.fcn_list[:limit]:
+        cc, nc, tt, ct, _callers = stats.stats[func]
+        filename, line, name = func
+        rows.append({
+            "function": f"{name} ({Path(filename).name}:{line})" if line else name,
+            "file": filename,
+            "calls": nc,
+            "tottime_ms": round(tt * 1000, 2),
+            "cumtime_ms": round(ct * 1000, 2),
+        })
+    return rows
@@ -0,0 +1,191 @@
+# core/retention.py
+# Kebijakan retensi data + perawatan database (dipakai command `prune_data`).
+#
+# Penghapusan dilakukan per potongan (RETENTION_CHUNK_SIZE baris, satu transaksi
+# per potongan) supaya tabel tidak terkunci lama. LetterRequest dihapus
+# tanpa signal per baris: ref_count PayloadBlob dikurangi sekaligus per potongan dan
+# cache jumlah status direset sekali per warga; blob yang jadi yatim dihapus paling akhir.
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DatabaseError, connections, router, transaction
+from django.utils import timezone
+
+from .counters import invalidate_status_counts
+from .models import LetterRequest, Notification, PayloadBlob, RequestStatus, StatusChange
+
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULTS = {
+    "RETENTION_NOTIFICATION_DAYS": 180,
+    "RETENTION_LETTER_DAYS": 730,
+    "RETENTION_STATUS_CHANGE_DAYS": 30,
+}
+# blob baru dibuat dengan ref_count 0 lalu dinaikkan; beri jeda supaya tidak ikut terhapus
+BLOB_GRACE = timedelta(hours=1)
+
+FINISHED_STATUSES = [RequestStatus.TELAH_DIAMBIL, RequestStatus.DITOLAK]
+
+
+def _days(name):
+    return getattr(settings, name, DEFAULTS[name])
+
+
+def chunk_size():
+    return getattr(settings, "RETENTION_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+
+
+def retention_querysets(now=None):
+    """[(label, queryset)] yang akan dihapus, urut sesuai urutan penghapusan."""
+    now = now or timezone.now()
+    policies = []
+
+    if apps.is_installed("django.contrib.sessions"):
+        from django.contrib.sessions.models import Session
+
+        policies.append(("session kedaluwarsa", Session.objects.filter(expire_date__lt=now)))
+
+    days = _days("RETENTION_STATUS_CHANGE_DAYS")
+    if days is not None:
+        policies.append((
+            f"status change ter-digest > {days} hari",
+            StatusChange.objects.filter(digested_at__lt=now - timedelta(days=days)),
+        ))
+
+    days = _days("RETENTION_NOTIFICATION_DAYS")
+    if days is not None:
+        policies.append((
+            f"notifikasi > {days} hari",
+            Notification.objects.filter(created_at__lt=now - timedelta(days=days)),
+        ))
+
+    days = _days("RETENTION_LETTER_DAYS")
+    if days is not None:
+        policies.append((
+            f"surat selesai > {days} hari",
+            LetterRequest.objects.filter(status__in=FINISHED_STATUSES, updated_at__lt=now - timedelta(days=days)),
+        ))
+
+    policies.append((
+        "payload blob tidak terpakai",
+        PayloadBlob.objects.unreferenced().filter(created_at__lt=now - BLOB_GRACE),
+    ))
+    return policies
+
+
+def _delete_letters(pks, using):
+    """
+    Hapus LetterRequest `pks` tanpa signal post_delete per baris (yang menjalankan satu
+    UPDATE PayloadBlob per surat). Mengembalikan jumlah surat yang terhapus.
+    """
+    rows = list(LetterRequest.objects.using(using).filter(pk__in=pks).values_list("user_id", "payload_blob_id"))
+    with transaction.atomic(using=using):
+        # _raw_delete: DELETE langsung tanpa Collector; cascade StatusChange dilakukan manual
+        StatusChange.objects.using(using).filter(letter_request_id__in=pks)._raw_delete(using)
+        deleted = LetterRequest.objects.using(using).filter(pk__in=pks)._raw_delete(using)
+        PayloadBlob.objects.db_manager(using).release_many(blob_id for _, blob_id in rows)
+    for user_id in {user_id for user_id, _ in rows}:
+        invalidate_status_counts(user_id)
+    return deleted
+
+
+def delete_in_chunks(queryset, size):
+    """Hapus semua baris queryset, `size` baris per query DELETE. Mengembalikan jumlah baris utama."""
+    model = queryset.model
+    total = 0
+    while True:
+        pks = list(queryset.order_by().values_list("pk", flat=True)[:size])
+        if not pks:
+            return total
+        if model is LetterRequest:
+            total += _delete_letters(pks, queryset.db)
+            continue
+        _, per_model = model.objects.using(queryset.db).filter(pk__in=pks).delete()
+        total += per_model.get(model._meta.label, 0)
+
+
+def prune(dry_run=False, size=None, now=None):
+    """Jalankan semua kebijakan retensi. Hasil: [(label, jumlah baris)]."""
+    size = size or chunk_size()
+    results = []
+    for label, queryset in retention_querysets(now):
+        if dry_run:
+            results.append((label, queryset.count()))
+        else:
+            results.append((label, delete_in_chunks(queryset, size)))
+    return results
+
+
+# ==========================
+# UKURAN & PERAWATAN DATABASE
+# ==========================
+
+def _connection():
+    # database tempat data surat berada (bisa database desa, lihat core/tenancy.py)
+    return connections[router.db_for_write(LetterRequest)]
+
+
+def _pragma(cursor, name):
+    cursor.execute(f"PRAGMA {name}")
+    return cursor.fetchone()[0]
+
+
+def database_size():
+    """Total ukuran file database (byte) dan byte yang kosong (freelist), khusus SQLite."""
+    connection = _connection()
+    if connection.vendor != "sqlite":
+        return None
+    with connection.cursor() as cursor:
+        page_size = _pragma(cursor, "page_size")
+        total = page_size * _pragma(cursor, "page_count")
+        free = page_size * _pragma(cursor, "freelist_count")
+    return {"total": total, "free": free}
+
+
+def object_sizes():
+    """{nama tabel/index: byte}. Kosong kalau backend tidak mendukung."""
+    connection = _connection()
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            try:
+                # butuh SQLite yang dikompilasi dengan SQLITE_ENABLE_DBSTAT_VTAB
+                cursor.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")
+            except DatabaseError:
+                return {}
+            return dict(cursor.fetchall())
+
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT c.relname, pg_relation_size(c.oid) FROM pg_class c "
+                "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "WHERE n.nspname = current_schema() AND c.relkind IN ('r', 'i')"
+            )
+            return dict(cursor.fetchall())
+    return {}
+
+
+def vacuum(full=False):
+    """
+    SQLite: kembalikan halaman kosong ke OS lalu ANALYZE. Kalau auto_vacuum belum
+    INCREMENTAL, hanya `full=True` yang menjalankan VACUUM penuh (sekali, sekaligus
+    mengubah mode ke INCREMENTAL agar run berikutnya cukup incremental_vacuum).
+    Backend lain: cukup ANALYZE (VACUUM diurus autovacuum server).
+    Mengembalikan daftar langkah yang dijalankan.
+    """
+    steps = []
+    connection = _connection()
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            mode = _pragma(cursor, "auto_vacuum")
+            if mode == 2:
+                cursor.execute("PRAGMA incremental_vacuum")
+                cursor.fetchall()  # pragma ini membebaskan satu halaman per baris hasil
+                steps.append("PRAGMA incremental_vacuum")
+            elif full:
+                cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                cursor.execute("VACUUM")
+                steps.append("VACUUM (auto_vacuum -> INCREMENTAL)")
+        cursor.execute("ANALYZE")
+        steps.append("ANALYZE")
+    return steps
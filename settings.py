@@ -20,10 +20,12 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.tenancy.VillageMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.profiling.SlowRequestProfilerMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -53,6 +55,7 @@ DATABASES = {
         "NAME": BASE_DIR / "db.sqlite3",
     }
 }
+DATABASE_ROUTERS = ["core.tenancy.VillageRouter"]
 
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -68,5 +71,64 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "satu-pintu-desa",
+        # key cache dipisah per desa aktif (core/tenancy.py)
+        "KEY_FUNCTION": "core.tenancy.cache_key",
+    }
+}
+
 AUTH_USER_MODEL = "core.User"
+AUTHENTICATION_BACKENDS = ["core.tenancy.VillageBackend"]
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Notifikasi status surat: False = satu notifikasi per perubahan status,
+# True = dikumpulkan lalu dikirim sebagai digest oleh
+# `python manage.py send_notification_digest` (jalankan via cron/Task Scheduler).
+NOTIFICATION_DIGEST = False
+NOTIFICATION_DIGEST_WINDOW_MINUTES = 60
+
+# Pesan yang tidak perlu ditunggu request (mis. selamat datang) dikirim oleh
+# worker thread setelah commit. False = langsung saat commit (untuk test).
+NOTIFICATION_QUEUE_ASYNC = True
+
+# Admin changelist LetterRequest/Notification untuk tabel besar (lihat core/admin.py).
+ADMIN_PERFORMANCE_MODE = True
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 10000
+ADMIN_FACET_CACHE_SECONDS = 60
+
+# Profiling request lambat (core/profiling.py). Nonaktif kecuali diaktifkan di sini.
+PROFILING_ENABLED = False
+PROFILING_SAMPLE_RATE = 0.05
+PROFILING_THRESHOLD_MS = 500
+PROFILING_DIR = BASE_DIR / "profiles"
+PROFILING_MAX_FILES = 50
+
+# Cache HTML halaman yang sering dibuka (core/page_cache.py): home, login,
+# pilih jenis surat, beranda warga. Per proses (LocMem); di server dengan banyak
+# worker ganti CACHES ke FileBasedCache/Redis supaya invalidasi terlihat semua worker.
+PAGE_CACHE_ENABLED = True
+PAGE_CACHE_SECONDS = 60 * 10
+
+# Antrian cetak surat DISETUJUI (core/printing.py, /staff/cetak/).
+# PRINT_WORKERS = 0 -> render di proses web sendiri (tanpa process pool).
+PRINT_WORKERS = 2
+PRINT_BATCH_SIZE = 50
+PRINT_KOP = "Pemerintah Desa"
+
+# Retensi data untuk `python manage.py prune_data` (jadwalkan harian).
+# None = kebijakan itu tidak dijalankan. Session kedaluwarsa selalu dihapus.
+RETENTION_NOTIFICATION_DAYS = 180
+RETENTION_LETTER_DAYS = 730  # hanya surat yang sudah selesai (diambil / ditolak)
+RETENTION_STATUS_CHANGE_DAYS = 30
+RETENTION_CHUNK_SIZE = 1000
+
+# Multi desa (core/tenancy.py). Desa dikenali dari Village.domain atau /desa/<slug>/.
+# Desa dengan database_name memakai file SQLite sendiri di VILLAGE_DATABASE_DIR
+# (buat tabelnya dengan `python manage.py village_run --all migrate`).
+VILLAGE_PATH_PREFIX = "desa"
+VILLAGE_DATABASE_DIR = BASE_DIR / "villages"
+VILLAGE_REQUIRED = False
+VILLAGE_CACHE_SECONDS = 60
@@ -0,0 +1,47 @@
+# core/signals.py
+# Receiver signal model; didaftarkan di CoreConfig.ready().
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .counters import invalidate_status_counts
+from .models import LetterRequest, Notification, PayloadBlob, Village
+from .page_cache import invalidate_user_pages
+from .tenancy import get_current_village, invalidate_village_index
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def reset_user_pages(sender, instance, created, update_fields=None, **kwargs):
+    # halaman ter-cache menampilkan nama/NIK; last_login saja tidak mengubahnya
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+    invalidate_user_pages(instance.pk)
+
+
+@receiver(post_save, sender=LetterRequest)
+@receiver(post_delete, sender=LetterRequest)
+def reset_status_counts(sender, instance, **kwargs):
+    invalidate_status_counts(instance.user_id)
+
+
+@receiver(post_delete, sender=LetterRequest)
+def release_payload_blob(sender, instance, **kwargs):
+    if instance.payload_blob_id:
+        PayloadBlob.objects.release(instance.payload_blob_id)
+
+
+@receiver(pre_save, sender=settings.AUTH_USER_MODEL)
+@receiver(pre_save, sender=LetterRequest)
+@receiver(pre_save, sender=Notification)
+def assign_village(sender, instance, **kwargs):
+    # data baru otomatis milik desa dari request yang membuatnya
+    if instance.village_id is None:
+        village = get_current_village()
+        if village is not None:
+            instance.village_id = village.pk
+
+
+@receiver(post_save, sender=Village)
+@receiver(post_delete, sender=Village)
+def reset_village_index(sender, instance, **kwargs):
+    invalidate_village_index()
@@ -0,0 +1,249 @@
+# core/tenancy.py
+# Banyak desa dalam satu deployment.
+#
+# Desa aktif ditentukan per request oleh VillageMiddleware, dari host
+# (Village.domain) atau prefix path (/desa/<slug>/...), lalu disimpan di contextvar.
+# Yang membaca contextvar itu:
+# - VillageRouter: desa dengan `database_name` memakai database sendiri (file SQLite
+#   sendiri, atau schema sendiri di PostgreSQL); alias koneksinya didaftarkan saat
+#   pertama dipakai. Desa tanpa `database_name` memakai database utama, datanya
+#   dipisah lewat kolom `village`.
+# - cache_key (CACHES KEY_FUNCTION): semua key cache otomatis dipisah per desa,
+#   karena id user/surat di database desa yang berbeda bisa sama.
+# - VillageBackend: akun desa lain tidak bisa login / dipakai di desa ini.
+#
+# Tanpa Village sama sekali (atau request tanpa desa) semuanya berjalan seperti
+# satu desa biasa di database utama.
+import contextvars
+import copy
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import Http404
+from django.urls import get_script_prefix, set_script_prefix
+
+
+DEFAULT_PATH_PREFIX = "desa"
+DEFAULT_CACHE_SECONDS = 60
+
+# key dengan awalan ini tidak dipisah per desa (lihat cache_key)
+GLOBAL_KEY_PREFIX = "core:global:"
+INDEX_CACHE_KEY = GLOBAL_KEY_PREFIX + "villages"
+
+_current_village = contextvars.ContextVar("current_village", default=None)
+_alias_lock = threading.Lock()
+
+
+def get_current_village():
+    return _current_village.get()
+
+
+@contextmanager
+def use_village(village):
+    """Jalankan blok kode sebagai desa `village` (untuk command, worker, test)."""
+    token = _current_village.set(village)
+    try:
+        yield village
+    finally:
+        _current_village.reset(token)
+
+
+# ==========================
+# DAFTAR DESA (di-cache)
+# ==========================
+
+def _village_index():
+    index = cache.get(INDEX_CACHE_KEY)
+    if index is None:
+        from .models import Village
+
+        villages = list(Village.objects.using(DEFAULT_DB_ALIAS).filter(is_active=True))
+        index = {
+            "host": {v.domain.lower(): v for v in villages if v.domain},
+            "slug": {v.slug: v for v in villages},
+        }
+        cache.set(INDEX_CACHE_KEY, index, getattr(settings, "VILLAGE_CACHE_SECONDS", DEFAULT_CACHE_SECONDS))
+    return index
+
+
+def invalidate_village_index():
+    cache.delete(INDEX_CACHE_KEY)
+
+
+def village_by_slug(slug):
+    return _village_index()["slug"].get(slug)
+
+
+def all_villages():
+    return list(_village_index()["slug"].values())
+
+
+def _path_prefix():
+    return getattr(settings, "VILLAGE_PATH_PREFIX", DEFAULT_PATH_PREFIX)
+
+
+def resolve_village(request):
+    """(village, prefix path) untuk request ini; prefix kosong kalau desa dari host."""
+    index = _village_index()
+    village = index["host"].get(request.get_host().split(":")[0].lower())
+    if village:
+        return village, ""
+
+    prefix = _path_prefix()
+    parts = request.path_info.split("/", 3)  # ["", "desa", "<slug>", "sisa"]
+    if prefix and len(parts) >= 3 and parts[1] == prefix:
+        village = index["slug"].get(parts[2])
+        if village:
+            return village, f"/{prefix}/{village.slug}"
+    return None, ""
+
+
+# ==========================
+# DATABASE PER DESA
+# ==========================
+
+def village_db_alias(village):
+    """Alias database desa; didaftarkan ke django.db.connections kalau belum ada."""
+    if not village or not village.database_name:
+        return DEFAULT_DB_ALIAS
+
+    alias = f"village_{village.slug}"
+    if alias not in connections.settings:
+        with _alias_lock:
+            if alias not in connections.settings:
+                connections.settings[alias] = _village_db_settings(village)
+    return alias
+
+
+def _village_db_settings(village):
+    db = copy.deepcopy(connections.settings[DEFAULT_DB_ALIAS])
+    engine = db["ENGINE"]
+    if engine.endswith("sqlite3"):
+        directory = Path(getattr(settings, "VILLAGE_DATABASE_DIR", Path(settings.BASE_DIR) / "villages"))
+        directory.mkdir(parents=True, exist_ok=True)
+        db["NAME"] = directory / f"{village.database_name}.sqlite3"
+    elif engine.endswith(("postgresql", "postgis")):
+        db["OPTIONS"] = {**db.get("OPTIONS", {}), "options": f"-c search_path={village.database_name},public"}
+    else:
+        raise ImproperlyConfigured(f"Database terpisah per desa belum didukung untuk {engine}.")
+    return db
+
+
+def has_own_database(village):
+    return bool(village and village.database_name)
+
+
+class VillageRouter:
+    """
+    Semua model ke database desa aktif (kalau desa itu punya database sendiri),
+    kecuali Village yang selalu di database utama.
+    """
+
+    def _db(self, model):
+        if model._meta.label_lower == "core.village":
+            return DEFAULT_DB_ALIAS
+        village = get_current_village()
+        if has_own_database(village):
+            return village_db_alias(village)
+        return None
+
+    def db_for_read(self, model, **hints):
+        return self._db(model)
+
+    def db_for_write(self, model, **hints):
+        return self._db(model)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # FK `village` tanpa constraint boleh menunjuk ke Village di database utama
+        if "core.village" in (obj1._meta.label_lower, obj2._meta.label_lower):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if app_label == "core" and model_name == "village":
+            return db == DEFAULT_DB_ALIAS
+        return None
+
+
+def scope_queryset(queryset):
+    """Filter per desa untuk desa yang berbagi database utama (desa dengan database sendiri sudah terpisah)."""
+    village = get_current_village()
+    if village and not has_own_database(village):
+        return queryset.filter(village_id=village.pk)
+    return queryset
+
+
+# ==========================
+# CACHE, LOGIN, MIDDLEWARE
+# ==========================
+
+def cache_key(key, key_prefix, version):
+    """KEY_FUNCTION untuk CACHES: key dipisah per desa aktif."""
+    village = get_current_village()
+    if village is None or key.startswith(GLOBAL_KEY_PREFIX):
+        return f"{key_prefix}:{version}:{key}"
+    return f"{key_prefix}:{version}:v{village.pk}:{key}"
+
+
+def _allowed_here(user):
+    village = get_current_village()
+    return village is None or user.village_id in (None, village.pk)
+
+
+class VillageBackend(ModelBackend):
+    """ModelBackend yang menolak akun milik desa lain (akun tanpa desa boleh di mana saja)."""
+
+    def user_can_authenticate(self, user):
+        return super().user_can_authenticate(user) and _allowed_here(user)
+
+    def get_user(self, user_id):
+        user = super().get_user(user_id)
+        return user if user is not None and _allowed_here(user) else None
+
+
+def _in_village(village, chunks):
+    # isi StreamingHttpResponse dibaca setelah middleware selesai; tetap jalankan di desa ini
+    iterator = iter(chunks)
+    while True:
+        with use_village(village):
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+        yield chunk
+
+
+class VillageMiddleware:
+    """Tentukan desa dari host atau /desa/<slug>/; pasang sebelum SessionMiddleware."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        village, prefix = resolve_village(request)
+        if village is None and getattr(settings, "VILLAGE_REQUIRED", False):
+            raise Http404("Desa tidak ditemukan.")
+
+        script_prefix = get_script_prefix()
+        if prefix:
+            # /desa/<slug>/warga/ -> /warga/, dan reverse() menghasilkan URL dengan prefix lagi
+            script_name = request.META.get("SCRIPT_NAME", "").rstrip("/")
+            request.path_info = request.path_info[len(prefix):] or "/"
+            request.META["SCRIPT_NAME"] = script_name + prefix
+            set_script_prefix(script_name + prefix + "/")
+
+        request.village = village
+        try:
+            with use_village(village):
+                response = self.get_response(request)
+        finally:
+            set_script_prefix(script_prefix)
+        if village is not None and response.streaming and not response.is_async:
+            response.streaming_content = _in_village(village, response.streaming_content)
+        return response
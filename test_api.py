@@ -0,0 +1,227 @@
+import json
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from core.models import LetterRequest, LetterType, Notification
+
+
+class TestApiSurat(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            nik="3201234501010003",
+            password="Password123!",
+            nama="Naswa Malika",
+            no_wa="081234567890",
+            email="naswa@example.com",
+        )
+        self.client.force_login(self.user)
+
+    def surat_data(self, **overrides):
+        data = {
+            "nama": "Naswa Malika",
+            "nik": "3201234501010003",
+            "tempat_lahir": "Bandung",
+            "tanggal_lahir": "2000-01-01",
+            "jenis_kelamin": "P",
+            "pekerjaan": "Mahasiswa",
+            "alamat": "Jl. Contoh No. 1",
+        }
+        data.update(overrides)
+        return data
+
+    def post_surat(self, body):
+        return self.client.post(reverse("api_surat"), data=json.dumps(body), content_type="application/json")
+
+    def make_letters(self, n):
+        for _ in range(n):
+            LetterRequest.objects.create(
+                user=self.user,
+                letter_type=LetterType.SKTM,
+                nama=self.user.nama,
+                nik=self.user.nik,
+                alamat="Jl. Contoh No. 1",
+                payload=self.surat_data(),
+            )
+
+    def test_jenis_surat_lists_every_type(self):
+        res = self.client.get(reverse("api_jenis_surat"))
+        self.assertEqual(res.status_code, 200)
+        values = [t["value"] for t in res.json()["results"]]
+        self.assertEqual(values, list(LetterType.values))
+
+    def test_requires_login(self):
+        self.client.logout()
+        res = self.client.get(reverse("api_surat"))
+        self.assertEqual(res.status_code, 401)
+
+    def test_submit_valid(self):
+        res = self.post_surat({"letter_type": "SKTM", "data": self.surat_data()})
+        self.assertEqual(res.status_code, 201, res.content)
+        lr = LetterRequest.objects.get()
+        self.assertEqual(res.json()["id"], lr.id)
+        self.assertEqual(lr.payload["tanggal_lahir"], "2000-01-01")
+
+    def test_submit_uses_form_validation(self):
+        res = self.post_surat({"letter_type": "SKTM", "data": self.surat_data(nik="3201234501010004")})
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("nik", res.json()["errors"])
+        self.assertFalse(LetterRequest.objects.exists())
+
+    def test_submit_data_must_be_object(self):
+        for data in (["nama"], "nama", 1):
+            res = self.post_surat({"letter_type": "SKTM", "data": data})
+            self.assertEqual(res.status_code, 400)
+            self.assertIn("data", res.json()["error"])
+        self.assertFalse(LetterRequest.objects.exists())
+
+    def test_submit_unknown_type(self):
+        res = self.post_surat({"letter_type": "KTP", "data": self.surat_data()})
+        self.assertEqual(res.status_code, 400)
+        res = self.post_surat({"letter_type": ["SKTM"], "data": self.surat_data()})
+        self.assertEqual(res.status_code, 400)
+
+    def test_submit_non_string_values(self):
+        # angka diperlakukan seperti input form; tanggal yang bukan format tanggal ditolak validasi
+        res = self.post_surat({"letter_type": "SKTM", "data": self.surat_data(tanggal_lahir=20000101)})
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("tanggal_lahir", res.json()["errors"])
+
+        res = self.post_surat({"letter_type": "SKTM", "data": self.surat_data(pekerjaan=["Petani"])})
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("pekerjaan", res.json()["error"])
+        self.assertFalse(LetterRequest.objects.exists())
+
+        res = self.post_surat({"letter_type": "SKTM", "data": self.surat_data(nik=3201234501010003)})
+        self.assertEqual(res.status_code, 201, res.content)
+
+    def test_status_cursor_pagination(self):
+        self.make_letters(5)
+        res = self.client.get(reverse("api_surat"), {"limit": 2})
+        body = res.json()
+        seen = [x["id"] for x in body["results"]]
+        while body["next_cursor"]:
+            body = self.client.get(reverse("api_surat"), {"limit": 2, "cursor": body["next_cursor"]}).json()
+            seen += [x["id"] for x in body["results"]]
+        expected = list(LetterRequest.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_status_bad_cursor(self):
+        res = self.client.get(reverse("api_surat"), {"cursor": "!!"})
+        self.assertEqual(res.status_code, 400)
+
+    def test_status_conditional_get(self):
+        self.make_letters(2)
+        res = self.client.get(reverse("api_surat"))
+        etag = res["ETag"]
+        self.assertTrue(res.has_header("Last-Modified"))
+
+        res = self.client.get(reverse("api_surat"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+
+        lr = LetterRequest.objects.first()
+        lr.status = "DISETUJUI"
+        lr.save()
+        res = self.client.get(reverse("api_surat"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+
+    def test_detail_other_user_is_404(self):
+        User = get_user_model()
+        other = User.objects.create_user(nik="3201234501010009", password="x", nama="Lain")
+        lr = LetterRequest.objects.create(
+            user=other, letter_type=LetterType.SKTM, nama="Lain", nik=other.nik, alamat="-", payload={},
+        )
+        res = self.client.get(reverse("api_surat_detail", args=[lr.id]))
+        self.assertEqual(res.status_code, 404)
+
+    def test_notifikasi_list(self):
+        Notification.objects.create(user=self.user, title="Surat Disetujui", message="ok")
+        res = self.client.get(reverse("api_notifikasi"))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["results"][0]["title"], "Surat Disetujui")
+        etag = res["ETag"]
+        res = self.client.get(reverse("api_notifikasi"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+
+        # menandai dibaca tidak mengubah jumlah maupun created_at, tapi ETag harus berubah
+        Notification.objects.update(is_read=True)
+        res = self.client.get(reverse("api_notifikasi"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.json()["results"][0]["is_read"])
+
+
+class TestApiBatch(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.staff = User.objects.create_user(nik="3201000000000001", password="x", nama="Operator", is_staff=True)
+        self.warga = [
+            User.objects.create_user(nik=f"32012345010100{i:02d}", password="x", nama=f"Warga {i}")
+            for i in range(3)
+        ]
+        self.client.force_login(self.staff)
+
+    def item(self, user, **overrides):
+        data = {
+            "nama": user.nama,
+            "tempat_lahir": "Bandung",
+            "tanggal_lahir": "2000-01-01",
+            "jenis_kelamin": "L",
+            "pekerjaan": "Petani",
+            "alamat": "Jl. Desa No. 2",
+            "agama": "ISLAM",
+        }
+        data.update(overrides)
+        return {"ref": user.nik, "nik": user.nik, "letter_type": "BELUM_MENIKAH", "data": data}
+
+    def post_batch(self, items):
+        return self.client.post(
+            reverse("api_surat_batch"), data=json.dumps({"items": items}), content_type="application/json",
+        )
+
+    def test_warga_cannot_use_batch(self):
+        self.client.force_login(self.warga[0])
+        res = self.post_batch([self.item(self.warga[0])])
+        self.assertEqual(res.status_code, 403)
+
+    def test_batch_partial_results(self):
+        items = [self.item(u) for u in self.warga]
+        items.append(self.item(self.warga[0], nama="Orang Lain"))
+        items.append({"nik": "3299999999999999", "letter_type": "SKTM", "data": {}})
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.post_batch(items)
+
+        # satu query nik__in dan satu INSERT untuk seluruh batch
+        sqls = [q["sql"] for q in ctx.captured_queries]
+        self.assertEqual(sum('"core_user"."nik" IN' in sql for sql in sqls), 1)
+        self.assertEqual(sum(sql.startswith('INSERT INTO "core_letterrequest"') for sql in sqls), 1)
+
+        body = res.json()
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual((body["created"], body["failed"]), (3, 2))
+        self.assertEqual([r["ok"] for r in body["results"]], [True, True, True, False, False])
+        self.assertIn("nama", body["results"][3]["errors"])
+        self.assertEqual(LetterRequest.objects.count(), 3)
+        self.assertEqual(
+            set(LetterRequest.objects.values_list("id", flat=True)),
+            {r["id"] for r in body["results"] if r["ok"]},
+        )
+
+    def test_batch_bad_types_fail_per_item(self):
+        items = [
+            self.item(self.warga[0]),
+            {**self.item(self.warga[1]), "letter_type": {"a": 1}},
+            self.item(self.warga[2], pekerjaan=["Petani"]),
+            self.item(self.warga[2], tanggal_lahir=20000101),
+        ]
+        res = self.post_batch(items)
+        self.assertEqual(res.status_code, 200)
+        body = res.json()
+        self.assertEqual([r["ok"] for r in body["results"]], [True, False, False, False])
+        self.assertEqual(body["results"][1]["error"], "Jenis surat tidak dikenal.")
+        self.assertIn("pekerjaan", body["results"][2]["error"])
+        self.assertIn("tanggal_lahir", body["results"][3]["errors"])
+        self.assertEqual(LetterRequest.objects.count(), 1)
@@ -0,0 +1,29 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from core.models import LetterRequest, Notification
+from core.views import FORM_BY_TYPE
+
+
+class TestGenerateFixtures(TestCase):
+    def _generate(self, *args):
+        call_command("generate_fixtures", "--users", "30", "--batch-size", "10", *args, stdout=StringIO())
+        return list(get_user_model().objects.order_by("nik").values_list("nik", "nama", "no_wa"))
+
+    def test_valid_and_deterministic(self):
+        first = self._generate()
+        self.assertEqual(len(first), 30)
+        for user in get_user_model().objects.all():
+            user.full_clean(exclude=["password"])
+
+        letters = LetterRequest.objects.select_related("user", "payload_blob")
+        self.assertTrue(letters.exists())
+        self.assertTrue(Notification.objects.exists())
+        for lr in letters:
+            form = FORM_BY_TYPE[lr.letter_type](lr.payload, user=lr.user)
+            self.assertTrue(form.is_valid(), form.errors)
+            self.assertLessEqual(lr.created_at, lr.updated_at)
+
+        self.assertEqual(self._generate("--clear"), first)
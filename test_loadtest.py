@@ -0,0 +1,43 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TransactionTestCase
+from django.contrib.auth import get_user_model
+from core.models import LetterRequest
+
+
+class TestLoadtestCommand(TransactionTestCase):
+    def run_loadtest(self, *args):
+        out = StringIO()
+        call_command("loadtest", "--residents", "2", "--staff", "1", "--concurrency", "1", *args, stdout=out)
+        return out.getvalue()
+
+    def test_small_run_reports_summary(self):
+        output = self.run_loadtest("--keep")
+        for line in ("Total request", "Warga selesai", "Error rate", "Lock timeout", "Histogram latensi"):
+            self.assertIn(line, output)
+        self.assertIn("verifikasi_pengajuan POST", output)
+        self.assertIn("Warga selesai   : 2 ", output)
+
+        # server di dalam proses menulis ke database test yang sama, bukan database lain
+        residents = get_user_model().objects.filter(nik__startswith="99")
+        self.assertEqual(residents.count(), 2)
+        self.assertEqual(LetterRequest.objects.filter(user__in=residents).count(), 2)
+
+        # staff uji hanya punya izin ubah surat dan bisa memakainya lewat admin
+        staff = get_user_model().objects.get(nik__startswith="98")
+        self.assertFalse(staff.is_superuser)
+        self.assertEqual(staff.get_all_permissions(), {"core.change_letterrequest"})
+
+    def test_cleanup_is_default(self):
+        self.run_loadtest()
+        self.assertFalse(get_user_model().objects.filter(nik__regex=r"^(98|99)").exists())
+        self.assertFalse(LetterRequest.objects.exists())
+
+    def test_password_changes_per_run(self):
+        first = self.run_loadtest("--keep").rsplit(": ", 1)[1].strip()
+        second = self.run_loadtest("--keep").rsplit(": ", 1)[1].strip()
+        self.assertNotEqual(first, second)
+        resident = get_user_model().objects.get(nik__startswith="99", nama="Warga Uji 0")
+        self.assertTrue(resident.check_password(second))
+        self.assertFalse(resident.check_password(first))
@@ -0,0 +1,68 @@
+from django.db import IntegrityError
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from core.models import LetterRequest, LetterType, PayloadBlob
+
+
+class TestPayloadBlob(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(nik="3201234501010003", password="x", nama="Naswa Malika")
+
+    def make(self, payload, **kwargs):
+        return LetterRequest(
+            user=self.user, letter_type=LetterType.SKTM, nama="Naswa Malika", nik=self.user.nik, alamat="-",
+            payload=payload, **kwargs,
+        )
+
+    def test_same_payload_shares_blob(self):
+        a = self.make({"nama": "Naswa Malika", "agama": "ISLAM"})
+        a.save()
+        b = self.make({"agama": "ISLAM", "nama": "Naswa Malika"})  # urutan key beda, isi sama
+        b.save()
+        self.assertEqual(a.payload_blob_id, b.payload_blob_id)
+        self.assertEqual(PayloadBlob.objects.get().ref_count, 2)
+        self.assertEqual(LetterRequest.objects.get(pk=b.pk).payload["agama"], "ISLAM")
+
+    def test_bulk_create_interns_payloads(self):
+        LetterRequest.objects.bulk_create([self.make({"x": 1}), self.make({"x": 1}), self.make({"x": 2})])
+        self.assertEqual(
+            sorted(PayloadBlob.objects.values_list("data__x", "ref_count")),
+            [(1, 2), (2, 1)],
+        )
+
+    def test_delete_releases_reference(self):
+        a = self.make({"x": 1})
+        a.save()
+        a.delete()
+        self.assertEqual(PayloadBlob.objects.unreferenced().count(), 1)
+
+    def test_changing_payload_moves_reference(self):
+        a = self.make({"x": 1})
+        a.save()
+        a.payload = {"x": 2}
+        a.save()
+        self.assertEqual(dict(PayloadBlob.objects.values_list("data__x", "ref_count")), {1: 0, 2: 1})
+
+    def test_residents_with_same_answers_share_blob(self):
+        other = get_user_model().objects.create_user(nik="3201234501010004", password="x", nama="Dewi Sartika")
+        answers = {"pekerjaan": "Petani", "agama": "ISLAM"}
+        a = self.make({"nama": "Naswa Malika", "nik": self.user.nik, "alamat": "-", **answers})
+        a.save()
+        b = LetterRequest(
+            user=other, letter_type=LetterType.SKTM, nama=other.nama, nik=other.nik, alamat="Jl. Mawar 2",
+            payload={"nama": other.nama, "nik": other.nik, "alamat": "Jl. Mawar 2", **answers},
+        )
+        b.save()
+        self.assertEqual(a.payload_blob_id, b.payload_blob_id)
+        self.assertEqual(PayloadBlob.objects.get().data, answers)
+        self.assertEqual(LetterRequest.objects.get(pk=b.pk).payload["nama"], "Dewi Sartika")
+        self.assertEqual(LetterRequest.objects.get(pk=a.pk).payload["nik"], self.user.nik)
+
+    def test_failed_save_does_not_leak_reference(self):
+        a = self.make({"x": 1}, status=None)  # NOT NULL, insert gagal
+        with self.assertRaises(IntegrityError):
+            a.save()
+        self.assertFalse(PayloadBlob.objects.exists())
+        self.assertIsNone(a.payload_blob_id)
+        self.assertEqual(a.payload, {"x": 1})
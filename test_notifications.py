@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from core.models import LetterRequest, LetterType, Notification, RequestStatus, StatusChange
+from core.notifications import notify_status_change, send_digests
+
+
+class TestDigestNotifications(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(nik="3201234501010003", password="x", nama="Naswa Malika")
+        self.letters = [
+            LetterRequest.objects.create(
+                user=self.user, letter_type=letter_type, nama=self.user.nama, nik=self.user.nik, alamat="-",
+            )
+            for letter_type in (LetterType.SKTM, LetterType.SKCK)
+        ]
+
+    def change_status(self, lr, status):
+        lr.status = status
+        lr.save()
+        notify_status_change(lr)
+
+    def test_without_digest_notifies_immediately(self):
+        self.change_status(self.letters[0], RequestStatus.DISETUJUI)
+        self.assertEqual(Notification.objects.get().title, "Surat Disetujui")
+        self.assertFalse(StatusChange.objects.exists())
+
+    @override_settings(NOTIFICATION_DIGEST=True)
+    def test_digest_coalesces_per_user(self):
+        self.change_status(self.letters[0], RequestStatus.DISETUJUI)
+        self.change_status(self.letters[0], RequestStatus.TELAH_DIAMBIL)
+        self.change_status(self.letters[1], RequestStatus.DISETUJUI)
+        self.change_status(self.letters[1], RequestStatus.DITOLAK)
+        self.assertFalse(Notification.objects.exists())
+
+        # belum lewat window
+        self.assertEqual(send_digests(window=timedelta(minutes=60)), 0)
+
+        later = timezone.now() + timedelta(minutes=61)
+        self.assertEqual(send_digests(window=timedelta(minutes=60), now=later), 1)
+
+        n = Notification.objects.get()
+        self.assertEqual(n.title, "Update Status Surat (2)")
+        self.assertIn("Surat Keterangan Tidak Mampu - Telah Diambil", n.message)
+        self.assertIn("Surat Pengantar SKCK - Ditolak", n.message)
+        self.assertFalse(StatusChange.objects.filter(digested_at__isnull=True).exists())
+
+        # tidak dikirim ulang
+        self.assertEqual(send_digests(window=timedelta(0), now=later), 0)
+
+    @override_settings(NOTIFICATION_DIGEST=True)
+    def test_single_change_keeps_original_message(self):
+        self.change_status(self.letters[0], RequestStatus.DISETUJUI)
+        send_digests(window=timedelta(0))
+        self.assertEqual(Notification.objects.get().title, "Surat Disetujui")
+
+    @override_settings(NOTIFICATION_DIGEST=True)
+    def test_rejection_alone_is_not_notified(self):
+        # sama dengan mode biasa: penolakan saja tidak dinotifikasi
+        self.change_status(self.letters[0], RequestStatus.DITOLAK)
+        self.assertEqual(send_digests(window=timedelta(0)), 0)
+        self.assertFalse(Notification.objects.exists())
+        self.assertFalse(StatusChange.objects.filter(digested_at__isnull=True).exists())
+
+    @override_settings(NOTIFICATION_DIGEST=True)
+    def test_single_letter_approved_then_rejected(self):
+        self.change_status(self.letters[0], RequestStatus.DISETUJUI)
+        self.change_status(self.letters[0], RequestStatus.DITOLAK)
+        send_digests(window=timedelta(0))
+        n = Notification.objects.get()
+        self.assertEqual(n.title, "Surat Ditolak")
+        self.assertEqual(n.message, "Surat Keterangan Tidak Mampu - Ditolak.")
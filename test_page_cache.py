@@ -0,0 +1,51 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from core.page_cache import invalidate_all_pages
+
+
+class TestPageCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(nik="3201234501010004", password="x", nama="Rina Lestari")
+        self.client.force_login(self.user)
+
+    def test_second_get_served_from_cache(self):
+        res = self.client.get(reverse("warga_home"))
+        self.assertIsNotNone(res.context)
+        res = self.client.get(reverse("warga_home"))
+        self.assertIsNone(res.context)  # tidak lewat template engine
+        self.assertContains(res, "Rina Lestari")
+
+    def test_csrf_token_fresh_on_cached_page(self):
+        self.client.get(reverse("ajukan_surat"))
+        res = self.client.get(reverse("ajukan_surat"))
+        self.assertIsNone(res.context)
+        self.assertNotContains(res, "__core_csrf_token__")
+        self.assertContains(res, 'name="csrfmiddlewaretoken"')
+
+        # form dari halaman cache tetap bisa di-submit dengan CSRF aktif
+        client = self.client_class(enforce_csrf_checks=True)
+        client.force_login(self.user)
+        client.get(reverse("ajukan_surat"))
+        page = client.get(reverse("ajukan_surat")).content.decode()
+        token = page.split('name="csrfmiddlewaretoken" value="')[1].split('"')[0]
+        res = client.post(reverse("ajukan_surat"), {"letter_type": "SKTM", "csrfmiddlewaretoken": token})
+        self.assertEqual(res.status_code, 302)
+
+    def test_user_change_invalidates(self):
+        self.client.get(reverse("warga_home"))
+        self.user.nama = "Rina Amelia"
+        self.user.save()
+        self.assertContains(self.client.get(reverse("warga_home")), "Rina Amelia")
+
+    def test_global_invalidation_and_per_user_key(self):
+        self.client.get(reverse("warga_home"))
+        invalidate_all_pages()
+        self.assertIsNotNone(self.client.get(reverse("warga_home")).context)
+
+        other = get_user_model().objects.create_user(nik="3201234501010005", password="x", nama="Budi Santoso")
+        self.client.force_login(other)
+        self.assertContains(self.client.get(reverse("warga_home")), "Budi Santoso")
@@ -0,0 +1,188 @@
+import os
+import sys
+import time
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from core.models import LetterRequest, LetterType, Notification, RequestStatus
+
+
+# Jumlah baris yang di-seed bertahap; jumlah query harus sama di setiap ukuran.
+SIZES = (5, 50, 250)
+
+# Anggaran per view: (maks query per request, maks ms per request), diukur dengan
+# cache kosong. Jumlah query sengaja pas: query baru harus menaikkan angka ini secara sadar.
+# Waktu sengaja longgar, hanya untuk menangkap render yang tumbuh dengan jumlah baris
+# (mis. halaman tanpa paginasi); dikali PERF_TIME_SCALE, dan PERF_TIME_SCALE=0 mematikannya.
+BUDGETS = {
+    "warga_home": (3, 1000),
+    "ajukan_surat": (3, 1000),
+    "isi_surat": (3, 1000),
+    "verifikasi_pengajuan": (3, 1000),
+    "pengajuan_diproses": (4, 1000),
+    "status_surat": (6, 2000),
+    "notifikasi": (4, 2000),
+    "admin_letterrequest_changelist": (8, 3000),
+    "admin_notification_changelist": (7, 3000),
+}
+TIME_SCALE = float(os.environ.get("PERF_TIME_SCALE", "1"))
+
+
+class QueryBudgetMixin:
+    """
+    assertQueryBudget(name, url, seed): seed data ke setiap ukuran di SIZES, lalu
+    pastikan jumlah query view tidak bertambah (bukan O(baris)), tidak melewati
+    BUDGETS[name], dan waktu render di bawah anggaran. Hasilnya dicetak sebagai
+    laporan di akhir test class.
+    """
+    report = None
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.report = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.report:
+            lines = [f"\n{'view':<34}{'query per ukuran':>22}{'anggaran':>10}{'ms maks':>10}{'anggaran':>10}"]
+            for name, (counts, worst_ms, (max_queries, max_ms)) in sorted(cls.report.items()):
+                lines.append(
+                    f"{name:<34}{'/'.join(map(str, counts)):>22}{max_queries:>10}"
+                    f"{worst_ms:>10.0f}{max_ms * TIME_SCALE:>10.0f}"
+                )
+            sys.stderr.write("\n".join(lines) + "\n")
+        super().tearDownClass()
+
+    def _measure(self, url):
+        cache.clear()  # ukur kondisi cache kosong (terburuk)
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            res = self.client.get(url)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        self.assertEqual(res.status_code, 200)
+        return ctx, elapsed_ms
+
+    def assertQueryBudget(self, name, url, seed):
+        max_queries, max_ms = BUDGETS[name]
+        seed(SIZES[0])
+        self.client.get(url)  # pemanasan: session, cache ContentType, dll.
+
+        counts, timings, last = [], [], None
+        for size in SIZES:
+            seed(size)
+            last, elapsed_ms = self._measure(url)
+            counts.append(len(last))
+            timings.append(elapsed_ms)
+        type(self).report[name] = (counts, max(timings), (max_queries, max_ms))
+
+        queries = "\n".join(q["sql"] for q in last.captured_queries)
+        self.assertEqual(len(set(counts)), 1, f"{name}: jumlah query naik dengan data {counts}\n{queries}")
+        self.assertLessEqual(counts[-1], max_queries, f"{name}: {counts[-1]} query > anggaran {max_queries}\n{queries}")
+        if TIME_SCALE:
+            self.assertLessEqual(
+                max(timings), max_ms * TIME_SCALE,
+                f"{name}: {max(timings):.0f} ms > anggaran {max_ms * TIME_SCALE:.0f} ms",
+            )
+
+
+class TestWargaQueryBudget(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(nik="3201234501010010", password="x", nama="Asep Sunandar")
+        self.client.force_login(self.user)
+
+    def seed_letters(self, size):
+        missing = size - LetterRequest.objects.filter(user=self.user).count()
+        types, statuses = LetterType.values, RequestStatus.values
+        LetterRequest.objects.bulk_create([
+            LetterRequest(
+                user=self.user,
+                letter_type=types[i % len(types)],
+                status=statuses[i % len(statuses)],
+                nama=self.user.nama,
+                nik=self.user.nik,
+                alamat="-",
+                payload={"nama": self.user.nama, "i": i},
+            )
+            for i in range(missing)
+        ])
+
+    def seed_notifications(self, size):
+        missing = size - Notification.objects.filter(user=self.user).count()
+        Notification.objects.bulk_create([
+            Notification(user=self.user, title=f"Notifikasi {i}", message="-") for i in range(missing)
+        ])
+
+    def seed_session_payload(self, size):
+        # yang dibaca verifikasi_pengajuan: payload form di session (makin banyak isian) + user
+        session = self.client.session
+        session["letter_type"] = LetterType.SKTM
+        session["surat_payload"] = {
+            "nama": self.user.nama, "nik": self.user.nik, "alamat": "-",
+            **{f"keterangan_{i}": "-" for i in range(size)},
+        }
+        session.save()
+
+    def seed_last_request(self, size):
+        self.seed_letters(size)
+        session = self.client.session
+        session["last_request_id"] = LetterRequest.objects.filter(user=self.user).latest("id").id
+        session.save()
+
+    # warga_home, ajukan_surat dan isi_surat tidak membaca data warga; surat tetap di-seed
+    # supaya query yang bergantung pada jumlah surat (mis. ringkasan di dashboard) ketahuan.
+    def test_warga_home(self):
+        self.assertQueryBudget("warga_home", reverse("warga_home"), self.seed_letters)
+
+    def test_ajukan_surat(self):
+        self.assertQueryBudget("ajukan_surat", reverse("ajukan_surat"), self.seed_letters)
+
+    def test_isi_surat(self):
+        self.assertQueryBudget("isi_surat", reverse("isi_surat", args=[LetterType.SKTM]), self.seed_letters)
+
+    def test_verifikasi_pengajuan(self):
+        self.assertQueryBudget("verifikasi_pengajuan", reverse("verifikasi_pengajuan"), self.seed_session_payload)
+
+    def test_pengajuan_diproses(self):
+        self.assertQueryBudget("pengajuan_diproses", reverse("pengajuan_diproses"), self.seed_last_request)
+
+    def test_status_surat(self):
+        self.assertQueryBudget("status_surat", reverse("status_surat"), self.seed_letters)
+
+    def test_notifikasi(self):
+        self.assertQueryBudget("notifikasi", reverse("notifikasi"), self.seed_notifications)
+
+
+class TestAdminQueryBudget(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.staff = User.objects.create_superuser(nik="3201234501019998", password="x", nama="Petugas")
+        self.client.force_login(self.staff)
+
+    def seed(self, size):
+        # banyak warga berbeda, supaya join / akses user per baris ikut terlihat
+        User = get_user_model()
+        start = LetterRequest.objects.count()
+        users = User.objects.bulk_create([
+            User(nik=f"32012345{i:08d}", nama=f"Warga {i}", password="x") for i in range(start, size)
+        ])
+        LetterRequest.objects.bulk_create([
+            LetterRequest(user=u, letter_type=LetterType.SKTM, nama=u.nama, nik=u.nik, alamat="-", payload={"i": u.nik})
+            for u in users
+        ])
+        Notification.objects.bulk_create([Notification(user=u, title="Info", message="-") for u in users])
+
+    def test_letterrequest_changelist(self):
+        self.assertQueryBudget(
+            "admin_letterrequest_changelist", reverse("admin:core_letterrequest_changelist"), self.seed
+        )
+
+    def test_notification_changelist(self):
+        self.assertQueryBudget(
+            "admin_notification_changelist", reverse("admin:core_notification_changelist"), self.seed
+        )
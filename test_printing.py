@@ -0,0 +1,103 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from core import printing
+from core.models import LetterRequest, LetterType, RequestStatus
+
+
+class FakePool:
+    """Pengganti ProcessPoolExecutor: render langsung, mencatat jumlah submit."""
+
+    def __init__(self, broken=False):
+        self.broken = broken
+        self.submitted = 0
+        self.shut_down = False
+
+    def submit(self, fn, batch):
+        self.submitted += 1
+        future = Future()
+        if self.broken:
+            future.set_exception(BrokenProcessPool("worker mati"))
+        else:
+            future.set_result(fn(batch))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+class TestAntrianCetak(TestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        self.staff = User.objects.create_user(nik="3201234501019999", password="x", nama="Petugas", is_staff=True)
+        warga = User.objects.create_user(nik="3201234501010006", password="x", nama="Dewi Sartika")
+        for i in range(5):
+            LetterRequest.objects.create(
+                user=warga,
+                letter_type=LetterType.SKTM,
+                status=RequestStatus.DISETUJUI if i < 3 else RequestStatus.DIPROSES,
+                nama=warga.nama,
+                nik=warga.nik,
+                alamat="Jl. Melati 1",
+                payload={"nama": warga.nama, "nik": warga.nik, "alamat": "Jl. Melati 1", "jenis_kelamin": "P"},
+            )
+        self.client.force_login(self.staff)
+        self.today = timezone.localdate().isoformat()
+
+    def _print(self, **data):
+        res = self.client.post(reverse("antrian_cetak"), {"tanggal": self.today, **data})
+        return b"".join(res.streaming_content).decode()
+
+    @override_settings(PRINT_WORKERS=0, PRINT_BATCH_SIZE=2)
+    def test_print_all_approved_and_mark_printed(self):
+        html = self._print()
+        self.assertEqual(html.count('<section class="surat">'), 3)
+        self.assertIn("Perempuan", html)
+        self.assertEqual(LetterRequest.objects.filter(printed_at__isnull=False).count(), 3)
+
+        # sudah dicetak: tidak ikut lagi kecuali cetak ulang
+        self.assertEqual(self._print().count('<section class="surat">'), 0)
+        self.assertEqual(self._print(ulang="1").count('<section class="surat">'), 3)
+
+    @override_settings(PRINT_BATCH_SIZE=2)
+    def test_process_pool(self):
+        html = self._print()
+        self.assertEqual(html.count('<section class="surat">'), 3)
+
+    def test_queue_page_counts(self):
+        res = self.client.get(reverse("antrian_cetak"))
+        self.assertEqual((res.context["belum"], res.context["sudah"]), (3, 0))
+
+    def _use_pool(self, pool):
+        self.enterContext(mock.patch.object(printing, "_executor", pool))
+
+    @override_settings(PRINT_WORKERS=1, PRINT_BATCH_SIZE=1)
+    def test_batches_submitted_incrementally(self):
+        pool = FakePool()
+        self._use_pool(pool)
+        chunks = printing.stream_print_document(printing.print_queue(timezone.localdate()), timezone.localdate())
+        next(chunks)  # kop dokumen
+        next(chunks)
+        # jendela 2x PRINT_WORKERS: batch ketiga belum dibaca saat batch pertama terkirim
+        self.assertEqual(pool.submitted, 2)
+        rest = "".join(chunks)
+        self.assertEqual(pool.submitted, 3)
+        self.assertEqual(rest.count('<section class="surat">'), 2)
+
+    @override_settings(PRINT_WORKERS=1, PRINT_BATCH_SIZE=1)
+    def test_broken_pool_is_reset_and_document_completed(self):
+        pool = FakePool(broken=True)
+        self._use_pool(pool)
+        with self.assertLogs("core.printing", "WARNING"):
+            html = self._print()
+        self.assertEqual(html.count('<section class="surat">'), 3)
+        self.assertEqual(LetterRequest.objects.filter(printed_at__isnull=False).count(), 3)
+        self.assertTrue(pool.shut_down)
+        self.assertIsNone(printing._executor)
@@ -0,0 +1,19 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+
+class TestProfileImports(SimpleTestCase):
+    def test_reports_phases_and_project_modules(self):
+        out = StringIO()
+        call_command("profile_imports", "--repeat", "1", "--top", "5", stdout=out)
+        output = out.getvalue()
+
+        self.assertIn("django.setup()", output)
+        self.assertIn("ROOT_URLCONF", output)
+        project = output.split("Modul proyek", 1)[1].split("Modul termahal", 1)[0]
+        self.assertIn("core.models", project)
+        self.assertIn("core.views", project)
+        # hanya diimpor saat halaman antrian cetak dibuka
+        self.assertNotIn("core.printing", project)
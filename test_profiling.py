@@ -0,0 +1,73 @@
+import cProfile
+import tempfile
+from pathlib import Path
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from core.profiling import SlowRequestProfilerMiddleware, list_profiles, profile_path, store_profile
+
+
+class TestSlowRequestProfiler(TestCase):
+    def setUp(self):
+        self.dir = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.enterContext(override_settings(PROFILING_DIR=self.dir))
+        User = get_user_model()
+        self.staff = User.objects.create_user(nik="3201234501019995", password="x", nama="Petugas", is_staff=True)
+        self.warga = User.objects.create_user(nik="3201234501010022", password="x", nama="Wahyu")
+
+    def profiles(self):
+        return sorted(p.name for p in self.dir.glob("*.prof"))
+
+    def test_disabled_by_default(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            SlowRequestProfilerMiddleware(lambda request: None)
+        self.client.force_login(self.staff)
+        self.client.get(reverse("login_warga"), headers={"X-Profile": "1"})
+        self.assertEqual(self.profiles(), [])
+
+    @override_settings(PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=0)
+    def test_header_forces_profile_for_staff_only(self):
+        self.client.force_login(self.warga)
+        self.client.get(reverse("login_warga"), headers={"X-Profile": "1"})
+        self.assertEqual(self.profiles(), [])
+
+        self.client.force_login(self.staff)
+        self.client.get(reverse("login_warga"))
+        self.assertEqual(self.profiles(), [])
+        self.client.get(reverse("login_warga"), headers={"X-Profile": "1"})
+        [meta] = list_profiles()
+        self.assertEqual((meta["path"], meta["forced"]), (reverse("login_warga"), True))
+
+    @override_settings(PROFILING_MAX_FILES=3)
+    def test_ring_buffer_keeps_newest(self):
+        ids = [store_profile(cProfile.Profile(), {"path": f"/{i}/"}) for i in range(5)]
+        self.assertEqual(self.profiles(), [f"{i}.prof" for i in ids[-3:]])
+        self.assertEqual(len(list(self.dir.glob("*.json"))), 3)
+
+    def test_download_is_staff_only(self):
+        profile_id = store_profile(cProfile.Profile(), {"path": "/"})
+        url = reverse("profil_unduh", args=[profile_id])
+
+        self.client.force_login(self.warga)
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 302)
+
+        self.client.force_login(self.staff)
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("attachment", res["Content-Disposition"])
+        res.close()
+
+    def test_profile_id_traversal_rejected(self):
+        (self.dir.parent / "rahasia.prof").write_bytes(b"x")
+        self.addCleanup((self.dir.parent / "rahasia.prof").unlink)
+        self.assertIsNone(profile_path("../rahasia"))
+        self.assertIsNone(profile_path("123/../../rahasia"))
+
+        self.client.force_login(self.staff)
+        res = self.client.get(reverse("profil_unduh", args=["..%2Frahasia"]))
+        self.assertEqual(res.status_code, 404)
+        res = self.client.get(reverse("profil_lambat"), {"id": "../rahasia"})
+        self.assertIsNone(res.context["selected"])
@@ -0,0 +1,57 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from core.models import Notification
+
+
+@override_settings(NOTIFICATION_QUEUE_ASYNC=False)
+class TestRegistrasi(TestCase):
+    def setUp(self):
+        self.User = get_user_model()
+        self.User.objects.create_user(nik="3201234501010003", password="x", nama="Naswa Malika")
+
+    def daftar_data(self, **overrides):
+        data = {
+            "nama": "Budi Santoso",
+            "nik": "3201234501010005",
+            "no_wa": "081234567890",
+            "email": "budi@example.com",
+            "password1": "Rahasia123!",
+            "password2": "Rahasia123!",
+        }
+        data.update(overrides)
+        return data
+
+    def test_cek_nik(self):
+        res = self.client.get(reverse("cek_nik"), {"nik": "3201234501010003"})
+        self.assertEqual(res.json()["available"], False)
+
+        res = self.client.get(reverse("cek_nik"), {"nik": "3201234501010005"})
+        self.assertEqual(res.json()["available"], True)
+
+        res = self.client.get(reverse("cek_nik"), {"nik": "123"})
+        self.assertEqual(res.json()["valid"], False)
+
+    def test_cek_nik_sees_user_registered_elsewhere(self):
+        self.client.get(reverse("cek_nik"), {"nik": "3201234501010005"})
+        # seperti pendaftaran di worker lain: tanpa signal / cache proses ini
+        self.User.objects.bulk_create([self.User(nik="3201234501010005", nama="Budi", password="x")])
+        res = self.client.get(reverse("cek_nik"), {"nik": "3201234501010005"})
+        self.assertEqual(res.json()["available"], False)
+
+    def test_daftar_queues_welcome(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(reverse("daftar_warga"), self.daftar_data())
+        self.assertRedirects(res, reverse("login_warga"), fetch_redirect_response=False)
+        user = self.User.objects.get(nik="3201234501010005")
+        self.assertEqual(Notification.objects.get(user=user).title, "Selamat Datang")
+
+    def test_daftar_race_maps_integrity_error(self):
+        # NIK lolos pengecekan form (seperti dua pendaftaran bersamaan), insert gagal di unique constraint
+        with mock.patch("core.nik_registry.is_registered", return_value=False):
+            res = self.client.post(reverse("daftar_warga"), self.daftar_data(nik="3201234501010003"))
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("NIK sudah terdaftar", res.content.decode())
+        self.assertEqual(self.User.objects.filter(nik="3201234501010003").count(), 1)
@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from core.counters import status_counts
+from core.models import LetterRequest, LetterType, Notification, PayloadBlob, RequestStatus, StatusChange
+from core.retention import FINISHED_STATUSES, delete_in_chunks, prune
+
+
+class TestPrune(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(nik="3201234501010008", password="x", nama="Siti")
+        old = timezone.now() - timedelta(days=1000)
+        for status in (RequestStatus.DITOLAK, RequestStatus.DIPROSES):
+            LetterRequest.objects.create(
+                user=self.user, letter_type="SKTM", status=status,
+                nama="Siti", nik=self.user.nik, alamat="-", payload={"status": status},
+            )
+        Notification.objects.create(user=self.user, title="Lama", message="-")
+        Notification.objects.create(user=self.user, title="Baru", message="-")
+        LetterRequest.objects.update(updated_at=old)
+        Notification.objects.filter(title="Lama").update(created_at=old)
+        PayloadBlob.objects.update(created_at=old)
+
+    def test_dry_run_deletes_nothing(self):
+        results = dict(prune(dry_run=True))
+        self.assertEqual(results["notifikasi > 180 hari"], 1)
+        self.assertEqual(Notification.objects.count(), 2)
+
+    def test_prune_in_chunks(self):
+        results = dict(prune(size=1))
+        self.assertEqual(results["surat selesai > 730 hari"], 1)
+        self.assertEqual(results["payload blob tidak terpakai"], 1)
+        self.assertEqual(list(LetterRequest.objects.values_list("status", flat=True)), [RequestStatus.DIPROSES])
+        self.assertEqual(list(Notification.objects.values_list("title", flat=True)), ["Baru"])
+        self.assertEqual(PayloadBlob.objects.count(), 1)
+
+    def test_letter_chunk_releases_blobs_in_bulk(self):
+        cache.clear()
+        old = timezone.now() - timedelta(days=1000)
+        letters = LetterRequest.objects.bulk_create([
+            LetterRequest(
+                user=self.user, letter_type=LetterType.SKCK, status=RequestStatus.TELAH_DIAMBIL,
+                nama="Siti", nik=self.user.nik, alamat="-", payload={"keperluan": "kerja"},
+            )
+            for _ in range(5)
+        ])
+        shared = letters[0].payload_blob
+        # satu surat aktif masih memakai blob yang sama
+        LetterRequest.objects.create(
+            user=self.user, letter_type=LetterType.SKCK, nama="Siti", nik=self.user.nik, alamat="-",
+            payload={"keperluan": "kerja"},
+        )
+        StatusChange.objects.create(user=self.user, letter_request=letters[0], status=RequestStatus.TELAH_DIAMBIL)
+        LetterRequest.objects.filter(status=RequestStatus.TELAH_DIAMBIL).update(updated_at=old)
+        self.assertEqual(status_counts(self.user.pk)[(LetterType.SKCK, RequestStatus.TELAH_DIAMBIL)], 5)
+
+        finished = LetterRequest.objects.filter(status__in=FINISHED_STATUSES)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(delete_in_chunks(finished, 100), 6)
+        blob_updates = [q for q in ctx.captured_queries if q["sql"].startswith('UPDATE "core_payloadblob"')]
+        self.assertEqual(len(blob_updates), 2)  # -5 untuk blob bersama, -1 untuk blob surat DITOLAK
+
+        shared.refresh_from_db()
+        self.assertEqual(shared.ref_count, 1)
+        self.assertFalse(StatusChange.objects.exists())
+        self.assertNotIn((LetterType.SKCK, RequestStatus.TELAH_DIAMBIL), status_counts(self.user.pk))
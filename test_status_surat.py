@@ -0,0 +1,96 @@
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from core.models import LetterRequest, LetterType, RequestStatus
+
+
+class TestStatusSuratFilter(TestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(nik="3201234501010003", password="x", nama="Naswa Malika")
+        for i in range(12):
+            LetterRequest.objects.create(
+                user=self.user,
+                letter_type=LetterType.SKTM if i % 2 else LetterType.SKCK,
+                status=RequestStatus.DISETUJUI if i < 3 else RequestStatus.DIPROSES,
+                nama=self.user.nama,
+                nik=self.user.nik,
+                alamat="-",
+            )
+        self.client.force_login(self.user)
+
+    def test_filter_by_type_and_status(self):
+        res = self.client.get(reverse("status_surat"), {"jenis": "SKTM", "status": "DISETUJUI"})
+        items = list(res.context["items"])
+        self.assertEqual(len(items), 1)
+        self.assertEqual((items[0].letter_type, items[0].status), ("SKTM", "DISETUJUI"))
+
+    def test_paginated(self):
+        res = self.client.get(reverse("status_surat"))
+        self.assertEqual(len(res.context["items"]), 10)
+        self.assertEqual(res.context["page_obj"].paginator.num_pages, 2)
+        res = self.client.get(reverse("status_surat"), {"page": 2})
+        self.assertEqual(len(res.context["items"]), 2)
+
+    def test_sort_oldest_first(self):
+        res = self.client.get(reverse("status_surat"), {"urut": "terlama"})
+        ids = [x.id for x in res.context["items"]]
+        self.assertEqual(ids, sorted(ids))
+
+    def test_count_comes_from_cache(self):
+        self.client.get(reverse("status_surat"))  # isi cache jumlah per status
+        # session, user, versi data (COUNT + MAX tanpa GROUP BY), halaman data (tanpa COUNT halaman)
+        with self.assertNumQueries(4):
+            self.client.get(reverse("status_surat"), {"status": "DIPROSES"})
+
+    def test_cache_invalidated_on_new_request(self):
+        self.client.get(reverse("status_surat"))
+        LetterRequest.objects.create(
+            user=self.user, letter_type=LetterType.DOMISILI, nama=self.user.nama, nik=self.user.nik, alamat="-",
+        )
+        res = self.client.get(reverse("status_surat"), {"jenis": "DOMISILI"})
+        self.assertEqual(len(res.context["items"]), 1)
+        self.assertEqual(res.context["total_all"], 13)
+
+    def test_stale_cached_count_falls_back_to_count(self):
+        self.client.get(reverse("status_surat"))  # cache: 12 surat
+        # dibuat lewat worker lain: tidak ada signal di proses ini, cache tetap 12
+        LetterRequest.objects.bulk_create([
+            LetterRequest(
+                user=self.user, letter_type=LetterType.DOMISILI, nama=self.user.nama, nik=self.user.nik, alamat="-",
+            )
+            for _ in range(9)
+        ])
+        res = self.client.get(reverse("status_surat"), {"urut": "terlama", "page": 2})
+        self.assertEqual(res.context["page_obj"].paginator.num_pages, 3)
+        self.assertEqual(len(res.context["items"]), 10)
+        self.assertEqual(res.context["total_all"], 21)
+
+        res = self.client.get(reverse("status_surat"), {"urut": "terlama", "page": 3})
+        self.assertEqual([lr.letter_type for lr in res.context["items"]], [LetterType.DOMISILI])
+
+    def test_status_change_elsewhere_updates_summary(self):
+        res = self.client.get(reverse("status_surat"))
+        summary = {value: n for value, _, n in res.context["status_summary"]}
+        self.assertEqual(summary[RequestStatus.DISETUJUI], 3)
+
+        # staff mengubah status di worker lain: total tetap 12, signal tidak sampai ke cache proses ini
+        LetterRequest.objects.filter(status=RequestStatus.DIPROSES).update(
+            status=RequestStatus.DISETUJUI, updated_at=timezone.now(),
+        )
+        res = self.client.get(reverse("status_surat"))
+        summary = {value: n for value, _, n in res.context["status_summary"]}
+        self.assertEqual((summary[RequestStatus.DISETUJUI], summary[RequestStatus.DIPROSES]), (12, 0))
+
+    @skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN khusus SQLite")
+    def test_default_order_uses_index(self):
+        qs = LetterRequest.objects.filter(user=self.user).order_by("-created_at", "-id")[:10]
+        plan = qs.explain()
+        self.assertIn("core_lr_user_created", plan)
+        self.assertNotIn("TEMP B-TREE FOR ORDER BY", plan)
@@ -0,0 +1,139 @@
+import json
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connections, router
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from core.models import LetterRequest, LetterType, RequestStatus, Village
+from core.tenancy import use_village
+
+
+class TestVillageTenancy(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.a = Village.objects.create(nama="Suka Maju", slug="sukamaju")
+        self.b = Village.objects.create(nama="Mekar Sari", slug="mekarsari", domain="mekarsari.test")
+
+    def test_path_prefix_resolves_village_and_urls(self):
+        res = self.client.get("/desa/sukamaju/login/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.wsgi_request.village, self.a)
+        self.assertContains(res, 'href="/desa/sukamaju/daftar/"')
+
+    @override_settings(ALLOWED_HOSTS=["mekarsari.test"])
+    def test_host_resolves_village(self):
+        res = self.client.get("/login/", HTTP_HOST="mekarsari.test")
+        self.assertEqual(res.wsgi_request.village, self.b)
+
+    def test_new_rows_belong_to_village_and_login_is_scoped(self):
+        with use_village(self.a):
+            user = get_user_model().objects.create_user(nik="3201234501010009", password="rahasia123", nama="Ani")
+        self.assertEqual(user.village_id, self.a.pk)
+
+        data = {"nik": user.nik, "password": "rahasia123"}
+        res = self.client.post("/desa/mekarsari/login/", data)
+        self.assertEqual(res.status_code, 200)  # ditolak di desa lain
+        res = self.client.post("/desa/sukamaju/login/", data)
+        self.assertRedirects(res, "/desa/sukamaju/warga/", fetch_redirect_response=False)
+
+    def test_cache_keys_separated_per_village(self):
+        with use_village(self.a):
+            cache.set("core:test", "a")
+        with use_village(self.b):
+            self.assertIsNone(cache.get("core:test"))
+        self.assertIsNone(cache.get("core:test"))
+
+    def test_router_uses_own_database(self):
+        self.addCleanup(connections.settings.pop, "village_jaya", None)
+        self.enterContext(override_settings(VILLAGE_DATABASE_DIR=tempfile.mkdtemp()))
+        self.assertEqual(router.db_for_write(LetterRequest), "default")
+        own = Village(nama="Jaya", slug="jaya", database_name="jaya")
+        with use_village(own):
+            self.assertEqual(router.db_for_write(LetterRequest), "village_jaya")
+            self.assertEqual(router.db_for_write(Village), "default")
+
+    def test_own_database_end_to_end(self):
+        self.enterContext(override_settings(VILLAGE_DATABASE_DIR=tempfile.mkdtemp()))
+        own = Village.objects.create(nama="Jaya", slug="jaya", database_name="jaya")
+        with use_village(own):
+            alias = router.db_for_write(LetterRequest)
+            self.addCleanup(connections.settings.pop, alias, None)
+            self.addCleanup(connections[alias].close)
+            # alias baru didaftarkan saat test berjalan; izinkan test ini memakainya
+            self.enterContext(mock.patch.object(type(self), "databases", {"default", alias}))
+            call_command("migrate", database=alias, verbosity=0)
+            get_user_model().objects.create_user(nik="3201234501010015", password="rahasia123", nama="Warga Jaya")
+
+        res = self.client.post("/desa/jaya/login/", {"nik": "3201234501010015", "password": "rahasia123"})
+        self.assertRedirects(res, "/desa/jaya/warga/", fetch_redirect_response=False)
+        data = {
+            "nama": "Warga Jaya", "nik": "3201234501010015", "tempat_lahir": "Bandung",
+            "tanggal_lahir": "2000-01-01", "jenis_kelamin": "L", "pekerjaan": "Petani", "alamat": "Jl. Jaya 1",
+        }
+        res = self.client.post(
+            "/desa/jaya/api/v1/surat/", data=json.dumps({"letter_type": "SKTM", "data": data}),
+            content_type="application/json",
+        )
+        self.assertEqual(res.status_code, 201, res.content)
+
+        self.assertEqual(alias, "village_jaya")
+        self.assertTrue(LetterRequest.objects.using(alias).filter(pk=res.json()["id"], nik="3201234501010015").exists())
+        self.assertFalse(LetterRequest.objects.using("default").exists())
+        self.assertFalse(get_user_model().objects.using("default").filter(nik="3201234501010015").exists())
+
+    def _approved_letter(self, village, nik, nama):
+        with use_village(village):
+            warga = get_user_model().objects.create_user(nik=nik, password="x", nama=nama)
+            return LetterRequest.objects.create(
+                user=warga, letter_type=LetterType.SKTM, status=RequestStatus.DISETUJUI,
+                nama=nama, nik=nik, alamat="-", payload={"nama": nama},
+            )
+
+    @override_settings(PRINT_WORKERS=0)
+    def test_print_queue_is_scoped_per_village(self):
+        own = self._approved_letter(self.a, "3201234501010011", "Warga Suka Maju")
+        other = self._approved_letter(self.b, "3201234501010012", "Warga Mekar Sari")
+        with use_village(self.a):
+            staff = get_user_model().objects.create_user(
+                nik="3201234501019997", password="x", nama="Petugas A", is_staff=True
+            )
+        self.client.force_login(staff)
+
+        res = self.client.get("/desa/sukamaju/staff/cetak/")
+        self.assertEqual((res.context["belum"], res.context["sudah"]), (1, 0))
+
+        res = self.client.post("/desa/sukamaju/staff/cetak/", {"tanggal": timezone.localdate().isoformat()})
+        html = b"".join(res.streaming_content).decode()
+        self.assertIn("Warga Suka Maju", html)
+        self.assertNotIn("Warga Mekar Sari", html)
+        own.refresh_from_db()
+        other.refresh_from_db()
+        self.assertIsNotNone(own.printed_at)
+        self.assertIsNone(other.printed_at)
+
+    def test_batch_api_rejects_other_village_nik(self):
+        with use_village(self.a):
+            staff = get_user_model().objects.create_user(
+                nik="3201234501019997", password="x", nama="Operator A", is_staff=True
+            )
+            own = get_user_model().objects.create_user(nik="3201234501010013", password="x", nama="Warga A")
+        with use_village(self.b):
+            other = get_user_model().objects.create_user(nik="3201234501010014", password="x", nama="Warga B")
+        self.client.force_login(staff)
+
+        data = {
+            "tempat_lahir": "Bandung", "tanggal_lahir": "2000-01-01", "jenis_kelamin": "L",
+            "pekerjaan": "Petani", "alamat": "Jl. Desa No. 2", "agama": "ISLAM",
+        }
+        items = [
+            {"nik": u.nik, "letter_type": "BELUM_MENIKAH", "data": {"nama": u.nama, **data}} for u in (own, other)
+        ]
+        res = self.client.post(
+            "/desa/sukamaju/api/v1/surat/batch/", data=json.dumps({"items": items}), content_type="application/json"
+        )
+        self.assertEqual([r["ok"] for r in res.json()["results"]], [True, False])
+        self.assertEqual(list(LetterRequest.objects.values_list("user_id", "village_id")), [(own.pk, self.a.pk)])
@@ -1,11 +1,12 @@
 from django.urls import path
-from . import views
+from . import api, views
 
 urlpatterns = [
     path("", views.home, name="home"),  # <-- ini tambahan
 
     # Auth warga
     path("daftar/", views.daftar_warga, name="daftar_warga"),
+    path("daftar/cek-nik/", views.cek_nik, name="cek_nik"),
     path("login/", views.login_warga, name="login_warga"),
     path("logout/", views.logout_view, name="logout"),
 
@@ -24,4 +25,16 @@ urlpatterns = [
     # Status & Notifikasi
     path("warga/status/", views.status_surat, name="status_surat"),
     path("warga/notifikasi/", views.notifikasi, name="notifikasi"),
+
+    # Staff
+    path("staff/cetak/", views.antrian_cetak, name="antrian_cetak"),
+    path("staff/profil/", views.profil_lambat, name="profil_lambat"),
+    path("staff/profil/<str:profile_id>/unduh/", views.profil_unduh, name="profil_unduh"),
+
+    # API JSON (kiosk / mobile)
+    path("api/v1/jenis-surat/", api.jenis_surat, name="api_jenis_surat"),
+    path("api/v1/surat/", api.surat_list, name="api_surat"),
+    path("api/v1/surat/batch/", api.surat_batch, name="api_surat_batch"),
+    path("api/v1/surat/<int:pk>/", api.surat_detail, name="api_surat_detail"),
+    path("api/v1/notifikasi/", api.notifikasi_list, name="api_notifikasi"),
 ]
\ No newline at end of file
@@ -1,12 +1,15 @@
 # core/views.py
-from datetime import date, datetime
+from datetime import date, datetime, time, timedelta
 
 from django.contrib.auth import authenticate, login, logout
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
+from django.db import IntegrityError, router, transaction
+from django.http import FileResponse, Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
+from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 
-from .auth_forms import WargaRegisterForm
 from .forms import (
     SKTMForm,
     DomisiliForm,
@@ -14,7 +17,13 @@ from .forms import (
     SKCKForm,
     VerifikasiForm,
 )
+from .counters import invalidate_status_counts, status_counts
 from .models import LetterRequest, LetterType, RequestStatus, Notification
+from .nik_registry import is_registered
+from .notifications import queue_welcome
+from .page_cache import cached_page
+from .pagination import CountedPaginator
+from .profiling import list_profiles, profile_path, top_functions
 
 
 FORM_BY_TYPE = {
@@ -41,6 +50,7 @@ def _jsonable(value):
 # ==========================
 
 @require_http_methods(["GET", "POST"])
+@cached_page
 def login_warga(request):
     error = None
     if request.method == "POST":
@@ -58,6 +68,7 @@ def login_warga(request):
 
     return render(request, "core/login.html", {"error": error})
 
+@cached_page
 def home(request):
     # kalau sudah login, arahkan sesuai role
     if request.user.is_authenticated:
@@ -75,26 +86,48 @@ def daftar_warga(request):
             return redirect("/admin/")
         return render(request, "core/daftar.html", {"blocked": True})
 
+    # form registrasi hanya dipakai di halaman ini, jadi diimpor saat dibutuhkan
+    from .auth_forms import WargaRegisterForm
+
     if request.method == "POST":
         form = WargaRegisterForm(request.POST)
         if form.is_valid():
             from django.contrib.auth import get_user_model
             User = get_user_model()
 
-            User.objects.create_user(
-                nik=form.cleaned_data["nik"],
-                password=form.cleaned_data["password1"],
-                nama=form.cleaned_data["nama"],
-                no_wa=form.cleaned_data["no_wa"],
-                email=form.cleaned_data["email"],
-            )
-            return redirect("login_warga")
+            try:
+                with transaction.atomic(using=router.db_for_write(User)):
+                    user = User.objects.create_user(
+                        nik=form.cleaned_data["nik"],
+                        password=form.cleaned_data["password1"],
+                        nama=form.cleaned_data["nama"],
+                        no_wa=form.cleaned_data["no_wa"],
+                        email=form.cleaned_data["email"],
+                    )
+            except IntegrityError:
+                # dua pendaftaran NIK yang sama bersamaan: unique constraint yang menentukan
+                form.add_error("nik", "NIK sudah terdaftar. Silahkan login.")
+            else:
+                queue_welcome(user)
+                return redirect("login_warga")
     else:
         form = WargaRegisterForm()
 
     return render(request, "core/daftar.html", {"form": form})
 
 
+@require_http_methods(["GET"])
+def cek_nik(request):
+    """Cek ketersediaan NIK untuk form daftar (dipanggil via AJAX)."""
+    nik = (request.GET.get("nik") or "").strip()
+    if not nik.isdigit() or len(nik) != 16:
+        return JsonResponse({"nik": nik, "valid": False, "available": False, "message": "NIK harus 16 digit angka."})
+
+    if is_registered(nik):
+        return JsonResponse({"nik": nik, "valid": True, "available": False, "message": "NIK sudah terdaftar. Silahkan login."})
+    return JsonResponse({"nik": nik, "valid": True, "available": True, "message": "NIK bisa dipakai."})
+
+
 @require_http_methods(["POST"])
 def logout_view(request):
     logout(request)
@@ -106,6 +139,7 @@ def logout_view(request):
 # ==========================
 
 @login_required
+@cached_page
 def warga_home(request):
     if request.user.is_staff:
         return redirect("/admin/")
@@ -118,6 +152,7 @@ def warga_home(request):
 
 @login_required
 @require_http_methods(["GET", "POST"])
+@cached_page
 def ajukan_surat(request):
     if request.user.is_staff:
         return redirect("/admin/")
@@ -233,13 +268,87 @@ def pengajuan_berhasil(request):
     return render(request, "core/berhasil.html", {"lr": lr})
 
 
+STATUS_PAGE_SIZE = 10
+
+STATUS_SORTS = {
+    "terbaru": ("-created_at", "-id"),
+    "terlama": ("created_at", "id"),
+}
+
+
+def _parse_date(value):
+    try:
+        return date.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+def _status_filters(request):
+    """Filter dari querystring; nilai yang tidak valid diabaikan."""
+    letter_type = request.GET.get("jenis") or ""
+    status = request.GET.get("status") or ""
+    sort = request.GET.get("urut") or "terbaru"
+    return {
+        "jenis": letter_type if letter_type in LetterType.values else "",
+        "status": status if status in RequestStatus.values else "",
+        "dari": _parse_date(request.GET.get("dari")),
+        "sampai": _parse_date(request.GET.get("sampai")),
+        "urut": sort if sort in STATUS_SORTS else "terbaru",
+    }
+
+
 @login_required
 def status_surat(request):
     if request.user.is_staff:
         return redirect("/admin/")
 
-    items = LetterRequest.objects.filter(user=request.user).order_by("-created_at")
-    return render(request, "core/status_surat.html", {"items": items})
+    filters = _status_filters(request)
+    items = LetterRequest.objects.filter(user=request.user)
+    if filters["jenis"]:
+        items = items.filter(letter_type=filters["jenis"])
+    if filters["status"]:
+        items = items.filter(status=filters["status"])
+
+    # rentang created_at (bukan created_at__date) supaya index tetap terpakai
+    tz = timezone.get_current_timezone()
+    if filters["dari"]:
+        items = items.filter(created_at__gte=datetime.combine(filters["dari"], time.min, tzinfo=tz))
+    if filters["sampai"]:
+        items = items.filter(created_at__lt=datetime.combine(filters["sampai"] + timedelta(days=1), time.min, tzinfo=tz))
+
+    # jumlah per (jenis, status) dari cache: dipakai untuk ringkasan dan total halaman
+    counts = status_counts(request.user.pk)
+    known_total = None
+    if not filters["dari"] and not filters["sampai"]:
+        known_total = sum(
+            n for (letter_type, status), n in counts.items()
+            if filters["jenis"] in ("", letter_type) and filters["status"] in ("", status)
+        )
+
+    paginator = CountedPaginator(items.order_by(*STATUS_SORTS[filters["urut"]]), STATUS_PAGE_SIZE, count=known_total)
+    page_obj = paginator.get_page(request.GET.get("page"))
+    if paginator.stale:
+        # jumlah di cache tidak cocok dengan isi tabel: bangun ulang supaya ringkasan ikut benar
+        invalidate_status_counts(request.user.pk)
+        counts = status_counts(request.user.pk)
+
+    per_status = {value: 0 for value in RequestStatus.values}
+    for (letter_type, status), n in counts.items():
+        per_status[status] = per_status.get(status, 0) + n
+
+    return render(
+        request,
+        "core/status_surat.html",
+        {
+            "items": page_obj.object_list,
+            "page_obj": page_obj,
+            "filters": filters,
+            "letter_types": LetterType.choices,
+            "statuses": RequestStatus.choices,
+            "status_summary": [(value, label, per_status[value]) for value, label in RequestStatus.choices],
+            "total_all": sum(counts.values()),
+        },
+    )
 
 
 @login_required
@@ -249,3 +358,63 @@ def notifikasi(request):
 
     items = Notification.objects.filter(user=request.user).order_by("-created_at")
     return render(request, "core/notifikasi.html", {"items": items})
+
+
+# ==========================
+# STAFF: PROFIL REQUEST LAMBAT
+# ==========================
+
+@staff_member_required
+def profil_lambat(request):
+    profiles = list_profiles()
+    selected, rows = None, []
+    sort = request.GET.get("urut") if request.GET.get("urut") in ("cumulative", "tottime") else "cumulative"
+
+    path = profile_path(request.GET.get("id"))
+    if path:
+        selected = next((p for p in profiles if p["id"] == path.stem), {"id": path.stem})
+        rows = top_functions(path, sort=sort)
+
+    return render(
+        request,
+        "core/profil.html",
+        {"profiles": profiles, "selected": selected, "rows": rows, "sort": sort},
+    )
+
+
+@staff_member_required
+def profil_unduh(request, profile_id):
+    path = profile_path(profile_id)
+    if not path:
+        raise Http404
+    return FileResponse(path.open("rb"), as_attachment=True, filename=f"{profile_id}.prof")
+
+
+# ==========================
+# STAFF: ANTRIAN CETAK
+# ==========================
+
+@staff_member_required
+@require_http_methods(["GET", "POST"])
+def antrian_cetak(request):
+    # printing memuat concurrent.futures.process + multiprocessing; hanya dipakai staff di halaman ini
+    from .printing import print_queue, stream_print_document
+
+    data = request.POST if request.method == "POST" else request.GET
+    day = _parse_date(data.get("tanggal")) or timezone.localdate()
+    ulang = bool(data.get("ulang"))
+
+    if request.method == "POST":
+        # satu dokumen HTML multi-halaman; dibuka di tab baru lalu dialog print muncul otomatis
+        return StreamingHttpResponse(
+            stream_print_document(print_queue(day, include_printed=ulang), day),
+            content_type="text/html; charset=utf-8",
+        )
+
+    belum = print_queue(day).count()
+    semua = print_queue(day, include_printed=True).count()
+    return render(
+        request,
+        "core/antrian_cetak.html",
+        {"tanggal": day, "belum": belum, "sudah": semua - belum},
+    )